@@ -7,9 +7,19 @@ Toute autre configuration provient des fichiers TOML.
 
 from __future__ import annotations
 
-# Import et export de la classe de document (personnalisée ou par défaut)
-from .document_registry import get_document_class
+__all__ = ["UPSTILatexDocument"]
 
-UPSTILatexDocument = get_document_class()
 
-__all__ = ["UPSTILatexDocument"]
+def __getattr__(name: str):
+    """Import paresseux de la classe de document (personnalisée ou par défaut).
+
+    La classe n'est résolue (et le module document importé) qu'au premier
+    accès à pyupstilatex.UPSTILatexDocument, puis mise en cache dans le module.
+    """
+    if name == "UPSTILatexDocument":
+        from .document_registry import get_document_class
+
+        document_class = get_document_class()
+        globals()["UPSTILatexDocument"] = document_class
+        return document_class
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
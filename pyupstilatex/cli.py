@@ -1,27 +1,32 @@
+import os
+import stat
+from operator import itemgetter
 from pathlib import Path
+from typing import Optional
 
 import click
 
-from .config import load_config
-from .document import UPSTILatexDocument
-from .file_helpers import (
-    JSON_CONFIG_PATH,
-    display_version,
-    format_nom_documents_for_display,
-    read_json_config,
-    scan_for_documents,
-)
 from .logger import (
+    ARROW_DEDUCTED,
+    ARROW_DEFAULT,
+    ARROW_ERROR,
+    ARROW_INFO,
+    ARROW_OK,
+    ARROW_WARNING,
     COLOR_DARK_GRAY,
     COLOR_GREEN,
-    COLOR_LIGHT_BLUE,
-    COLOR_LIGHT_GREEN,
     COLOR_ORANGE,
     COLOR_RED,
     COLOR_RESET,
     MessageHandler,
 )
 
+# Séparateur associé à chaque type de métadonnée (hors display_flag "info")
+_ARROW_PAR_TYPE_META = {
+    "default": ARROW_DEFAULT,
+    "deducted": ARROW_DEDUCTED,
+    "ignored": ARROW_ERROR,
+}
 
 @click.group()
 @click.option(
@@ -38,6 +43,8 @@ def main(ctx, log_file, no_verbose):
     """pyUPSTIlatex CLI"""
     handler = MessageHandler(log_file=log_file, verbose=not no_verbose)
     ctx.obj = {"msg": handler}
+    # Le fichier de log reste ouvert pendant toute la commande
+    ctx.call_on_close(handler.close)
 
 
 @main.command()
@@ -112,61 +119,55 @@ def infos(ctx, path):
         return _exit_with_messages(ctx, msg, messages)
 
     if metadata:
-        # Préparer la liste des éléments affichables et calculer la largeur max
+        # Préparer en une passe les éléments affichables (séparateur coloré et
+        # valeur déjà choisis) et calculer la largeur max des labels
         items = []
+        max_label_len = 0
         for meta in metadata.values():
             label = meta.get("label")
-            valeur = (
-                meta.get("valeur")
-                if meta.get("valeur") is not None
-                else meta.get("raw_value", "")
-            )
+            if len(label) > max_label_len:
+                max_label_len = len(label)
+            valeur = meta.get("valeur")
+            if valeur is None:
+                valeur = meta.get("raw_value", "")
             if isinstance(valeur, list):
                 valeur = ", ".join(str(v) for v in valeur)
-            initial_value = meta.get("initial_value", "")
-            display_flag = meta.get("display_flag", "")
-
-            # type_meta peut être de la forme "default" ou "default:wrong_type"
-            tm_raw = meta.get("type_meta") or ""
-            tm_parts = tm_raw.split(":", 1)
-            main_type = tm_parts[0] if tm_parts and tm_parts[0] else ""
-            cause_type = tm_parts[1] if len(tm_parts) > 1 else ""
-            items.append(
-                (label, valeur, main_type, cause_type, initial_value, display_flag)
-            )
 
-        max_label_len = max((len(lbl) for lbl, _, _, _, _, _ in items), default=0)
-
-        # Afficher les lignes avec alignement des ':'
-        # Vérifier l'affichage en fonction des nouveaux mots clés
-        for label, valeur, type_meta, cause_meta, initial_value, display_flag in items:
             # colorer le label selon s'il s'agit d'une valeur par défaut
-            if display_flag == "info":
-                separateur_colored = f"{COLOR_LIGHT_BLUE}=>{COLOR_RESET}"
-            elif type_meta == "default":
-                separateur_colored = f"{COLOR_DARK_GRAY}=>{COLOR_RESET}"
-                if cause_meta:
-                    separateur_colored = f"{COLOR_ORANGE}=>{COLOR_RESET}"
+            if meta.get("display_flag", "") == "info":
+                separateur_colored = ARROW_INFO
+            else:
+                # type_meta peut être de la forme "default" ou "default:wrong_type"
+                type_meta, cause_meta = _split_type_meta(meta.get("type_meta") or "")
+                separateur_colored = _ARROW_PAR_TYPE_META.get(type_meta, ARROW_OK)
+                if type_meta == "default" and cause_meta:
+                    separateur_colored = ARROW_WARNING
                     valeur = (
                         f"{COLOR_ORANGE}{valeur} (avant correction: "
-                        f"'{initial_value}'){COLOR_RESET}"
+                        f"'{meta.get('initial_value', '')}'){COLOR_RESET}"
                     )
-            elif type_meta == "deducted":
-                separateur_colored = f"{COLOR_LIGHT_GREEN}=>{COLOR_RESET}"
-            elif type_meta == "ignored":
-                separateur_colored = f"{COLOR_RED}=>{COLOR_RESET}"
-                valeur = f"{COLOR_RED}ignoré: '{initial_value}'{COLOR_RESET}"
-            else:
-                separateur_colored = f"{COLOR_GREEN}=>{COLOR_RESET}"
+                elif type_meta == "ignored":
+                    valeur = (
+                        f"{COLOR_RED}ignoré: '{meta.get('initial_value', '')}'"
+                        f"{COLOR_RESET}"
+                    )
+            items.append((label, separateur_colored, valeur))
 
+        # Afficher les lignes avec alignement des ':'
+        indent_width = max_label_len + 6  # label + " => " + 2 (mystère)
+        saut_aligne = "\n" + " " * indent_width
+        rows = []
+        for label, separateur_colored, valeur in items:
             # Gérer les sauts de ligne dans valeur pour l'alignement
-            indent_width = max_label_len + 6  # label + " => " + 2 (mystère)
-            valeur_aligned = str(valeur).replace("\n", "\n" + " " * indent_width)
+            valeur_aligned = str(valeur).replace("\n", saut_aligne)
+
+            # padding: aligner les labels à droite pour aligner ':'
+            rows.append(
+                f"{label.rjust(max_label_len)} {separateur_colored} {valeur_aligned}"
+            )
 
-            # padding: ajouter des espaces après le label pour aligner ':'
-            pad = max_label_len - len(label)
-            padding = " " * pad
-            msg.info(f"{padding}{label} {separateur_colored} {valeur_aligned}")
+        # Une seule émission pour toutes les lignes
+        msg.info_block(rows)
 
     # Erreurs rencontrées
     if messages:
@@ -175,14 +176,13 @@ def infos(ctx, path):
 
     # Légende des symboles
     msg.separateur1()
-    msg.info(
-        f"{COLOR_GREEN}=>{COLOR_RESET} valeur définie dans le fichier tex, "
-        f"{COLOR_LIGHT_GREEN}=>{COLOR_RESET} valeur déduite, "
-        f"{COLOR_DARK_GRAY}=>{COLOR_RESET} valeur par défaut"
-    )
-    msg.info(
-        f"{COLOR_ORANGE}=>{COLOR_RESET} WARNING, "
-        f"{COLOR_RED}=>{COLOR_RESET} ERROR, {COLOR_LIGHT_BLUE}=>{COLOR_RESET} INFO"
+    msg.info_block(
+        [
+            f"{ARROW_OK} valeur définie dans le fichier tex, "
+            f"{ARROW_DEDUCTED} valeur déduite, "
+            f"{ARROW_DEFAULT} valeur par défaut",
+            f"{ARROW_WARNING} WARNING, {ARROW_ERROR} ERROR, {ARROW_INFO} INFO",
+        ]
     )
     return _exit_with_separator(ctx, msg)
 
@@ -228,6 +228,9 @@ def infos(ctx, path):
 def liste_fichiers(ctx, path, exclude, show_full_path, filter_mode, compilability):
     """Affiche la liste des fichiers UPSTI_document dans un ou plusieurs dossiers."""
 
+    from .config import load_config
+    from .file_helpers import format_nom_documents_for_display, scan_for_documents
+
     msg: MessageHandler = ctx.obj["msg"]
     cfg = load_config()
 
@@ -280,48 +283,44 @@ def liste_fichiers(ctx, path, exclude, show_full_path, filter_mode, compilabilit
         msg.affiche_messages(messages, "info")
         return _exit_with_separator(ctx, msg)
 
-    # Afficher les documents trouvés
-    if not documents:
-        msg.info("Aucun document trouvé.", flag="warning")
-    else:
-        # Préparer les chemins d'affichage (tronqués) puis calculer les largeurs
-        # format_nom_documents_for_display ajoute la clé 'display_path' en place.
-        format_nom_documents_for_display(documents)
-        display_key = "path" if show_full_path else "display_path"
-        max_path = max(len(d[display_key]) for d in documents)
-        max_version = max(
-            len(display_version(d["version_pyupstilatex"], d["version_latex"]))
-            for d in documents
-        )
-
-        # Afficher chaque document
-        for doc in sorted(documents, key=lambda x: x["path"]):
-            path_padded = doc[display_key].ljust(max_path)
-            version_text = display_version(
-                doc["version_pyupstilatex"], doc["version_latex"]
-            ).ljust(max_version)
-
-            # Colorer la version selon le paramètre compiler
-            version_colored = f"{COLOR_DARK_GRAY}│{COLOR_RESET} "
-            if doc.get("a_compiler", False):
-                version_colored += f"{version_text}"
-            else:
-                version_colored += f"{COLOR_DARK_GRAY}{version_text}{COLOR_RESET}"
+    # Afficher les documents trouvés, puis les erreurs/avertissements du scan,
+    # dans un même lot d'écritures
+    with msg.batch():
+        if not documents:
+            msg.info("Aucun document trouvé.", flag="warning")
+        else:
+            # Préparer les chemins d'affichage (tronqués) puis calculer les largeurs
+            # format_nom_documents_for_display ajoute la clé 'display_path' en place.
+            format_nom_documents_for_display(documents)
+            display_key = "path" if show_full_path else "display_path"
+            max_path, max_version = _compute_widths(documents, display_key)
+
+            # Afficher chaque document
+            for doc in sorted(documents, key=itemgetter("path")):
+                path_padded = doc[display_key].ljust(max_path)
+                version_text = doc["display_version"].ljust(max_version)
+
+                # Colorer la version selon le paramètre compiler
+                version_colored = f"{COLOR_DARK_GRAY}│{COLOR_RESET} "
+                if doc.get("a_compiler", False):
+                    version_colored += f"{version_text}"
+                else:
+                    version_colored += f"{COLOR_DARK_GRAY}{version_text}{COLOR_RESET}"
 
-            msg.info(f"{path_padded} {version_colored}")
+                msg.info(f"{path_padded} {version_colored}")
 
-        # Total
-        nb_documents = len(documents)
-        msg.separateur2()
-        msg.info(
-            f"Total de {COLOR_GREEN}{nb_documents}{COLOR_RESET} "
-            "document(s) trouvé(s)."
-        )
+            # Total
+            nb_documents = len(documents)
+            msg.separateur2()
+            msg.info(
+                f"Total de {COLOR_GREEN}{nb_documents}{COLOR_RESET} "
+                "document(s) trouvé(s)."
+            )
 
-    # Erreurs/avertissements rencontrés
-    if messages:
-        msg.separateur2()
-        msg.affiche_messages(messages, "info")
+        # Erreurs/avertissements rencontrés
+        if messages:
+            msg.separateur2()
+            msg.affiche_messages(messages, "info")
 
     return _exit_with_separator(ctx, msg)
 
@@ -347,8 +346,13 @@ def liste_fichiers(ctx, path, exclude, show_full_path, filter_mode, compilabilit
 def compile(ctx, path, mode, dry_run):
     """Compile un fichier .tex ou tous les fichiers d'un dossier."""
 
+    from concurrent.futures import ThreadPoolExecutor
     from pathlib import Path
 
+    from .config import load_config
+    from .document import UPSTILatexDocument
+    from .file_helpers import scan_for_documents
+
     chemin = Path(path)
     msg: MessageHandler = ctx.obj["msg"]
     compilation_unique = False
@@ -369,12 +373,14 @@ def compile(ctx, path, mode, dry_run):
     msg.titre1(f"COMPILATION de {chemin}")
 
     # Gérer le cas où le chemin fourni est invalide nous-mêmes
-    if not chemin.exists():
+    # (un seul appel stat pour l'existence et le type)
+    chemin_stat = _stat_or_none(chemin)
+    if chemin_stat is None:
         msg.info(f"Fichier ou dossier introuvable : {chemin}", flag="error")
         return _exit_with_separator(ctx, msg)
 
     # Cas où on a un dossier
-    if chemin.is_dir():
+    if stat.S_ISDIR(chemin_stat.st_mode):
         # Liste des fichiers contenus dans le dossier passé en paramètres
         msg.titre2("Recherche de tous les fichiers tex UPSTI_document à compiler")
         documents_a_convertir, messages = scan_for_documents(
@@ -400,18 +406,12 @@ def compile(ctx, path, mode, dry_run):
             return _exit_with_messages(ctx, msg, messages, separator_before=True)
 
         # Affichage de la liste des documents trouvés (avec numérotation)
-        max_name = max(len(d["filename"]) for d in documents_a_convertir)
-        max_version = max(
-            len(display_version(d["version_pyupstilatex"], d["version_latex"]))
-            for d in documents_a_convertir
-        )
+        max_name, max_version = _compute_widths(documents_a_convertir, "filename")
 
         for idx, d in enumerate(
-            sorted(documents_a_convertir, key=lambda x: x["filename"]), start=1
+            sorted(documents_a_convertir, key=itemgetter("filename")), start=1
         ):
-            version_text = display_version(
-                d["version_pyupstilatex"], d["version_latex"]
-            )
+            version_text = d["display_version"]
             msg.info(
                 f"{d['filename']:{max_name}}  "
                 f"{COLOR_DARK_GRAY}│{COLOR_RESET} {version_text:>{max_version}}"
@@ -440,7 +440,7 @@ def compile(ctx, path, mode, dry_run):
                 msg.titre2(f"Compilation de : {documents_a_convertir[0]['filename']}")
                 compilation_unique = True
                 doc = UPSTILatexDocument.from_path(
-                    documents_a_convertir[0]["path"], msg=msg
+                    documents_a_convertir[0]["path"], msg=msg, trusted=True
                 )[0]
 
             else:
@@ -454,33 +454,57 @@ def compile(ctx, path, mode, dry_run):
                 # Calculer la largeur de numérotation (1 pour 1-9, 2 pour 10-99, ...)
                 num_width = len(str(nb_documents))
 
-                # Compiler chaque document (numérotation cohérente)
-                for idx, doc in enumerate(documents_a_convertir, start=1):
-
-                    if nb_documents > 1:
-                        number_label = f"{idx:0{num_width}d}"
-                        msg.info(
-                            f"{COLOR_DARK_GRAY}{number_label}/{nb_documents} - "
-                            f"{COLOR_RESET}{doc['filename']}"
+                # Les documents ne sont chargés qu'après confirmation, chacun
+                # pendant la compilation du précédent (au plus un d'avance, pour
+                # ne pas compiler un contenu lu longtemps avant). Le
+                # gestionnaire de messages est rattaché sur le thread principal.
+                def charge_document(d):
+                    document = UPSTILatexDocument.from_path(d["path"], trusted=True)[0]
+                    # Les vérifications de DocumentFile sont paresseuses : on les
+                    # déclenche ici, ainsi que la lecture (contenu mis en cache)
+                    if document is not None and document.is_readable:
+                        try:
+                            document.content
+                        except Exception:
+                            # L'erreur sera signalée par compile()
+                            pass
+                    return document
+
+                with ThreadPoolExecutor(max_workers=1) as executor:
+                    suivant = executor.submit(charge_document, documents_a_convertir[0])
+
+                    # Compiler chaque document (numérotation cohérente)
+                    for idx, doc in enumerate(documents_a_convertir, start=1):
+                        document = suivant.result()
+                        if idx < nb_documents:
+                            suivant = executor.submit(
+                                charge_document, documents_a_convertir[idx]
+                            )
+                        document.msg = msg
+
+                        if nb_documents > 1:
+                            number_label = f"{idx:0{num_width}d}"
+                            msg.info(
+                                f"{COLOR_DARK_GRAY}{number_label}/{nb_documents} - "
+                                f"{COLOR_RESET}{doc['filename']}"
+                            )
+
+                        # Lancer la compilation
+                        result, messages = document.compile(
+                            mode=mode, verbose=compile_verbose, dry_run=dry_run
                         )
+                        # Protéger contre un statut inattendu
+                        if result in statut_compilation_fichiers:
+                            statut_compilation_fichiers[result].append(doc['filename'])
+                        else:
+                            # Statut inattendu : traiter comme erreur
+                            statut_compilation_fichiers['error'].append(doc['filename'])
 
-                    # Lancer la compilation
-                    document = UPSTILatexDocument.from_path(doc["path"], msg=msg)[0]
-                    result, messages = document.compile(
-                        mode=mode, verbose=compile_verbose, dry_run=dry_run
-                    )
-                    # Protéger contre un statut inattendu
-                    if result in statut_compilation_fichiers:
-                        statut_compilation_fichiers[result].append(doc['filename'])
-                    else:
-                        # Statut inattendu : traiter comme erreur
-                        statut_compilation_fichiers['error'].append(doc['filename'])
-
-                    if nb_documents > 1:
-                        if affiche_details and result == "success":
-                            messages.append(["OK !", "success"])
+                        if nb_documents > 1:
+                            if affiche_details and result == "success":
+                                messages.append(["OK !", "success"])
 
-                        msg.affiche_messages(messages, "resultat_item")
+                            msg.affiche_messages(messages, "resultat_item")
 
                 # Message de conclusion
                 msg.separateur1()
@@ -514,9 +538,9 @@ def compile(ctx, path, mode, dry_run):
                 return _exit_with_separator(ctx, msg)
 
     # Cas où on a un fichier unique
-    elif chemin.is_file():
+    elif stat.S_ISREG(chemin_stat.st_mode):
         # Vérification et instanciation centralisées
-        doc = _check_path(ctx, chemin)
+        doc = _check_path(ctx, chemin, chemin_stat)
         compilation_unique = True
 
     if compilation_unique:
@@ -558,6 +582,8 @@ def poly(ctx, path, poly_type):
 
     from pathlib import Path
 
+    from .config import load_config
+
     chemin = Path(path)
     msg: MessageHandler = ctx.obj["msg"]
 
@@ -615,6 +641,9 @@ def update_config(ctx):
     Utile pour corriger un document dont les données sont mal détectées ou pour forcer
     la mise à jour après correction d'erreurs dans le fichier tex.
     """
+    from .config import load_config
+    from .file_helpers import JSON_CONFIG_PATH, read_json_config
+
     msg: MessageHandler = ctx.obj["msg"]
 
     msg.titre1("MISE À JOUR du fichier de configuration : pyUPSTIlatex.json")
@@ -788,6 +817,8 @@ def prepare(ctx, path, version_cible):
 
     from pathlib import Path
 
+    from .file_helpers import read_json_config, scan_for_documents
+
     chemin = Path(path)
     msg: MessageHandler = ctx.obj["msg"]
 
@@ -833,11 +864,7 @@ def prepare(ctx, path, version_cible):
         return _exit_with_messages(ctx, msg, messages, separator_before=True)
 
     # Affichage de la liste des documents trouvés (avec numérotation)
-    max_name = max(len(d["filename"]) for d in documents_a_preparer)
-    max_version = max(
-        len(display_version(d["version_pyupstilatex"], d["version_latex"]))
-        for d in documents_a_preparer
-    )
+    max_name, max_version = _compute_widths(documents_a_preparer, "filename")
 
     # Calculer largeur d'affichage du numéro: 1/2/3 selon le nombre total
     num_width = len(str(nb_documents))
@@ -845,10 +872,10 @@ def prepare(ctx, path, version_cible):
         num_width = 3
 
     # On classe par ordre alphabétique et on affiche la liste
-    documents_a_preparer = sorted(documents_a_preparer, key=lambda x: x["filename"])
+    documents_a_preparer = sorted(documents_a_preparer, key=itemgetter("filename"))
 
     for idx, d in enumerate(documents_a_preparer, start=1):
-        version_text = display_version(d["version_pyupstilatex"], d["version_latex"])
+        version_text = d["display_version"]
         number_label = f"{idx:>{num_width}d}"
         msg.info(
             f"{number_label}. {d['filename']:{max_name}}  "
@@ -990,19 +1017,80 @@ def _exit_with_messages(ctx, msg, messages, separator_before=False):
     return _exit_with_separator(ctx, msg)
 
 
-def _check_path(ctx, chemin: Path):
+# Cache des type_meta déjà découpés (vocabulaire restreint : "default",
+# "default:wrong_type", "deducted", "ignored", ...)
+_TYPE_META_CACHE: dict[str, tuple[str, str]] = {}
+
+
+def _split_type_meta(type_meta: str) -> tuple[str, str]:
+    """Découpe un type_meta "principal:cause" en (principal, cause), avec cache."""
+    result = _TYPE_META_CACHE.get(type_meta)
+    if result is None:
+        main_type, _, cause_type = type_meta.partition(":")
+        result = (main_type, cause_type)
+        _TYPE_META_CACHE[type_meta] = result
+    return result
+
+
+def _compute_widths(documents: list[dict], key: str) -> tuple[int, int]:
+    """Calcule en une seule passe les largeurs d'affichage d'une liste de documents.
+
+    Ajoute au passage la clé 'display_version' (texte de version) à chaque
+    document, pour ne pas la recalculer lors de l'affichage.
+
+    Paramètres
+    ----------
+    documents : list[dict]
+        Documents retournés par scan_for_documents.
+    key : str
+        Clé dont on veut la largeur maximale (ex: 'filename', 'display_path').
+
+    Retourne
+    --------
+    tuple[int, int]
+        (largeur max de la clé, largeur max du texte de version).
+    """
+    from .file_helpers import display_version
+
+    max_key = max_version = 0
+    for d in documents:
+        version_text = display_version(d["version_pyupstilatex"], d["version_latex"])
+        d["display_version"] = version_text
+        key_len = len(d[key])
+        if key_len > max_key:
+            max_key = key_len
+        version_len = len(version_text)
+        if version_len > max_version:
+            max_version = version_len
+    return max_key, max_version
+
+
+def _stat_or_none(chemin: Path) -> Optional[os.stat_result]:
+    """Retourne le résultat de os.stat pour le chemin, ou None s'il n'existe pas."""
+    try:
+        return os.stat(chemin)
+    except (OSError, ValueError):
+        return None
+
+
+def _check_path(ctx, chemin: Path, chemin_stat: Optional[os.stat_result] = None):
     """Vérifie le chemin, instancie le document et contrôle la lisibilité.
 
     En cas d'erreur, affiche les messages appropriés et sort via les helpers.
-    Retourne l'objet `UPSTILatexDocument` si tout est OK.
+    Retourne l'objet `UPSTILatexDocument` si tout est OK. Si le résultat de
+    os.stat sur le chemin est déjà connu, il peut être passé via chemin_stat.
     """
+    from .document import UPSTILatexDocument
+
     msg: MessageHandler = ctx.obj["msg"]
 
-    # Vérifications du chemin
-    if not chemin.exists() or not chemin.is_file():
+    # Vérifications du chemin (un seul appel stat)
+    if chemin_stat is None:
+        chemin_stat = _stat_or_none(chemin)
+    if chemin_stat is None or not stat.S_ISREG(chemin_stat.st_mode):
         erreur = (
             "Chemin incorrect"
-            if not chemin.exists()
+            if chemin_stat is None
             else "Le chemin n'indique pas un fichier"
         )
         msg.info(f"{erreur} : {chemin}", flag="fatal_error")
@@ -34,20 +34,22 @@ Configuration Sections:
 - LegacyConfig: pour la compatibilité ascendante (à supprimer à terme)
 
 Notes:
-- All values are read from os.environ at call time (no persistent cache),
-  so changing env at runtime is reflected on next call.
+- load_config() is cached: TOML files are read and the dataclasses built only
+  once, and again only if one of the files changes (modification date). Call
+  load_config.cache_clear() to force a reload (e.g. after changing the
+  environment at runtime).
+- The get_* helpers read os.environ at call time (no cache).
 - For booleans, accepted values: 1, true, yes, y, on; falsy: 0, false, no, n, off.
 - For paths, get_path returns a pathlib.Path (no existence check).
 - For lists, get_list splits by separator (default ";") and filters empty strings.
 """
 
-from __future__ import annotations
-
 import os
 import sys
 from dataclasses import dataclass
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Any, Iterable, Optional
+from typing import Any, Iterable, Mapping, Optional, Union
 
 # Support TOML pour Python 3.11+ (tomllib) et versions antérieures (tomli)
 if sys.version_info >= (3, 11):
@@ -78,32 +80,46 @@ __all__ = [
 ]
 
 
+# Accès direct à os.environ.get (évite la résolution d'attribut à chaque clé)
+_env_get = os.environ.get
+
+
 def get_str(key: str, default: Optional[str] = None) -> Optional[str]:
-    """Return an environment variable as string, or default if missing."""
-    return os.environ.get(key, default)
+    """Return an environment variable as string, or default if missing.
+
+    Never returns None when a non-None default is given (no need for an extra
+    `or default` at call sites).
+    """
+    return _env_get(key, default)
 
 
 def get_int(key: str, default: Optional[int] = None) -> Optional[int]:
     """Return an environment variable parsed as int, or default if invalid/missing."""
-    val = os.environ.get(key)
+    return _parse_int(_env_get(key), default)
+
+
+def _parse_int(val: Optional[str], default: Optional[int]) -> Optional[int]:
     if val is None:
         return default
     try:
-        return int(str(val).strip())
+        return int(val)
     except (TypeError, ValueError):
         return default
 
 
-_TRUTHY = {"1", "true", "yes", "y", "on"}
-_FALSY = {"0", "false", "no", "n", "off"}
+_TRUTHY = frozenset(("1", "true", "yes", "y", "on"))
+_FALSY = frozenset(("0", "false", "no", "n", "off"))
 
 
 def get_bool(key: str, default: bool = False) -> bool:
     """Return an environment variable parsed as bool, or default if invalid/missing."""
-    val = os.environ.get(key)
+    return _parse_bool(_env_get(key), default)
+
+
+def _parse_bool(val: Optional[str], default: bool) -> bool:
     if val is None:
         return default
-    s = str(val).strip().lower()
+    s = val.strip().lower()
     if s in _TRUTHY:
         return True
     if s in _FALSY:
@@ -115,9 +131,9 @@ def get_bool(key: str, default: bool = False) -> bool:
         return default
 
 
-def get_path(key: str, default: Optional[str | Path] = None) -> Path:
+def get_path(key: str, default: Optional[Union[str, Path]] = None) -> Path:
     """Return an environment variable as Path. Uses default if missing."""
-    val = os.environ.get(key)
+    val = _env_get(key)
     if val is None:
         return Path(default) if default is not None else Path()
     return Path(val)
@@ -132,17 +148,29 @@ def get_list(
     - Filters out empty segments
     - If missing, returns list(default) or []
     """
-    val = os.environ.get(key)
+    return _parse_list(_env_get(key), default, sep)
+
+
+def _parse_list(
+    val: Optional[str], default: Optional[Iterable[str]], sep: str
+) -> list[str]:
     if val is None:
         return list(default) if default is not None else []
-    parts = [p.strip() for p in val.split(sep)]
-    return [p for p in parts if p]
+    return [item for item in (p.strip() for p in val.split(sep)) if item]
 
 
 # =========================
 # TOML Configuration Loading
 # =========================
 
+# Chemins des fichiers de configuration, en chaînes simples : calculés une
+# seule fois (un seul realpath) plutôt qu'à chaque appel de load_config().
+_PACKAGE_DIR = os.path.dirname(os.path.realpath(__file__))
+_DEFAULT_CONFIG_PATH = os.path.join(_PACKAGE_DIR, "config", "config.default.toml")
+_CUSTOM_DIR = os.path.join(os.path.dirname(_PACKAGE_DIR), "custom")
+_CUSTOM_CONFIG_PATH = os.path.join(_CUSTOM_DIR, "config.toml")
+_CUSTOM_ENV_PATH = os.path.join(_CUSTOM_DIR, ".env")
+
 
 def _deep_merge(base: dict[str, Any], override: dict[str, Any]) -> dict[str, Any]:
     """Merge override dict into base dict recursively.
@@ -182,12 +210,12 @@ def _flatten_toml_to_env(data: dict[str, Any], prefix: str = "") -> dict[str, st
     return result
 
 
-def _load_toml_file(path: Path) -> dict[str, Any]:
+def _load_toml_file(path: Union[str, Path]) -> dict[str, Any]:
     """Load a TOML file and return its content as dict."""
     if not tomllib:
         return {}
 
-    if not path.exists():
+    if not os.path.isfile(path):
         return {}
 
     try:
@@ -233,32 +261,31 @@ def _load_config_from_toml() -> None:
 
     Loading order (later overrides earlier):
     1. custom/.env for secrets (FTP_*, SITE_SECRET_KEY) — si le fichier existe
+       et si PYUPSTI_SKIP_DOTENV ne vaut pas "1"
     2. pyupstilatex/config/config.default.toml (versioned defaults)
     3. custom/config.toml (local overrides, not versioned)
 
     Si custom/.env n'existe pas, les valeurs par défaut de config.py sont utilisées.
     """
-    # Paths
-    package_dir = Path(__file__).resolve().parent
-    default_config_path = package_dir / "config" / "config.default.toml"
-    custom_config_path = package_dir.parent / "custom" / "config.toml"
-    custom_env_path = package_dir.parent / "custom" / ".env"
-
     # Load custom/.env for secrets FIRST (so they take priority over TOML)
     # Si le fichier n'existe pas, on utilise les valeurs par défaut de config.py
-    if custom_env_path.exists():
+    # PYUPSTI_SKIP_DOTENV=1 permet de ne pas lire ce fichier (secrets déjà
+    # fournis par l'environnement).
+    if os.environ.get("PYUPSTI_SKIP_DOTENV") != "1" and os.path.isfile(
+        _CUSTOM_ENV_PATH
+    ):
         try:
             from dotenv import load_dotenv
 
-            load_dotenv(custom_env_path, override=True)
+            load_dotenv(_CUSTOM_ENV_PATH, override=True)
         except Exception:
             pass
 
     # Load default config
-    default_config = _load_toml_file(default_config_path)
+    default_config = _load_toml_file(_DEFAULT_CONFIG_PATH)
 
     # Load and merge custom config
-    custom_config = _load_toml_file(custom_config_path)
+    custom_config = _load_toml_file(_CUSTOM_CONFIG_PATH)
     merged_config = _deep_merge(default_config, custom_config)
 
     # Inject into environment
@@ -268,7 +295,35 @@ def _load_config_from_toml() -> None:
 # =========================
 # Section-based dataclasses
 # =========================
-@dataclass(frozen=True)
+# Sections sans __dict__ (slots=True n'existe qu'à partir de Python 3.10)
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Chaque section déclare un _SPEC : tuple de (champ, variable d'env, type, défaut).
+# Les listes sont toutes séparées par des virgules (valeurs issues du TOML).
+_PARSERS = {
+    "str": lambda val, default: default if val is None else val,
+    "int": _parse_int,
+    "bool": _parse_bool,
+    "list": lambda val, default: _parse_list(val, default, ","),
+}
+
+
+def _build_from_spec(cls, env: Optional[Mapping[str, str]] = None):
+    """Instancie une section de configuration à partir de son _SPEC.
+
+    Les valeurs sont lues dans env (instantané de l'environnement) ou, à
+    défaut, directement dans os.environ.
+    """
+    env_get = os.environ.get if env is None else env.get
+    return cls(
+        **{
+            field_name: _PARSERS[kind](env_get(env_key), default)
+            for field_name, env_key, kind, default in cls._SPEC
+        }
+    )
+
+
+@dataclass(frozen=True, **_SLOTS)
 class MetaConfig:
     """Valeurs par défaut des métadonnées documents (provenant du .env)."""
 
@@ -281,21 +336,23 @@ class MetaConfig:
     version: str
     auteur: str
 
+    _SPEC = (
+        ("id_document_prefixe", "META_DEFAULT_ID_DOCUMENT_PREFIXE", "str", "EB:"),
+        ("variante", "META_DEFAULT_VARIANTE", "str", "upsti"),
+        ("matiere", "META_DEFAULT_MATIERE", "str", "S2I"),
+        ("classe", "META_DEFAULT_CLASSE", "str", "PT"),
+        ("type_document", "META_DEFAULT_TYPE_DOCUMENT", "str", "cours"),
+        ("titre", "META_DEFAULT_TITRE", "str", "Titre par défaut"),
+        ("version", "META_DEFAULT_VERSION", "str", "0.1"),
+        ("auteur", "META_DEFAULT_AUTEUR", "str", "Emmanuel BIGEARD"),
+    )
+
     @classmethod
-    def from_env(cls) -> "MetaConfig":
-        return cls(
-            id_document_prefixe=get_str("META_DEFAULT_ID_DOCUMENT_PREFIXE", "EB:"),
-            variante=get_str("META_DEFAULT_VARIANTE", "upsti"),
-            matiere=get_str("META_DEFAULT_MATIERE", "S2I"),
-            classe=get_str("META_DEFAULT_CLASSE", "PT"),
-            type_document=get_str("META_DEFAULT_TYPE_DOCUMENT", "cours"),
-            titre=get_str("META_DEFAULT_TITRE", "Titre par défaut"),
-            version=get_str("META_DEFAULT_VERSION", "0.1"),
-            auteur=get_str("META_DEFAULT_AUTEUR", "Emmanuel BIGEARD"),
-        )
-
-
-@dataclass(frozen=True)
+    def from_env(cls, env: Optional[Mapping[str, str]] = None) -> "MetaConfig":
+        return _build_from_spec(cls, env)
+
+
+@dataclass(frozen=True, **_SLOTS)
 class CompilationConfig:
     """Valeurs par défaut pour la compilation, provenant du .env"""
 
@@ -322,55 +379,75 @@ class CompilationConfig:
     affichage_detaille_dans_console: bool
     copier_fichier_version: bool
 
+    _SPEC = (
+        # Defaults (from COMPILATION_DEFAUT_* env vars)
+        ("compiler", "COMPILATION_DEFAUT_COMPILER", "bool", True),
+        ("ignorer", "COMPILATION_DEFAUT_IGNORER", "bool", False),
+        (
+            "renommer_automatiquement",
+            "COMPILATION_DEFAUT_RENOMMER_AUTOMATIQUEMENT",
+            "bool",
+            True,
+        ),
+        (
+            "versions_a_compiler",
+            "COMPILATION_DEFAUT_VERSIONS_A_COMPILER",
+            "list",
+            ("prof", "eleve"),
+        ),
+        (
+            "versions_accessibles_a_compiler",
+            "COMPILATION_DEFAUT_VERSIONS_ACCESSIBLES_A_COMPILER",
+            "list",
+            (),
+        ),
+        (
+            "est_un_document_a_trous",
+            "COMPILATION_DEFAUT_EST_UN_DOCUMENT_A_TROUS",
+            "bool",
+            False,
+        ),
+        (
+            "copier_pdf_dans_dossier_cible",
+            "COMPILATION_DEFAUT_COPIER_PDF_DANS_DOSSIER_CIBLE",
+            "bool",
+            True,
+        ),
+        ("upload", "COMPILATION_DEFAUT_UPLOAD", "bool", True),
+        (
+            "query_webhook_apres_upload",
+            "COMPILATION_DEFAUT_QUERY_WEBHOOK_APRES_UPLOAD",
+            "bool",
+            False,
+        ),
+        ("creer_miniature", "COMPILATION_DEFAUT_CREER_MINIATURE", "bool", False),
+        ("hauteur_miniature", "COMPILATION_DEFAUT_HAUTEUR_MINIATURE", "int", 600),
+        ("upload_diaporama", "COMPILATION_DEFAUT_UPLOAD_DIAPORAMA", "bool", True),
+        ("dossier_ftp", "COMPILATION_DEFAUT_DOSSIER_FTP", "str", "/"),
+        # Paramètres de compilation LaTeX
+        (
+            "latex_nombre_compilations",
+            "COMPILATION_LATEX_NOMBRE_COMPILATIONS",
+            "int",
+            2,
+        ),
+        ("latex_compilateur", "COMPILATION_LATEX_COMPILATEUR", "str", "pdflatex"),
+        # Compilation
+        (
+            "affichage_detaille_dans_console",
+            "COMPILATION_AFFICHAGE_DETAILLE_DANS_CONSOLE",
+            "bool",
+            False,
+        ),
+        ("copier_fichier_version", "COMPILATION_COPIER_FICHIER_VERSION", "bool", True),
+    )
+
     @classmethod
-    def from_env(cls) -> "CompilationConfig":
-        return cls(
-            # Defaults (from COMPILATION_DEFAUT_* env vars)
-            compiler=get_bool("COMPILATION_DEFAUT_COMPILER", True),
-            ignorer=get_bool("COMPILATION_DEFAUT_IGNORER", False),
-            renommer_automatiquement=get_bool(
-                "COMPILATION_DEFAUT_RENOMMER_AUTOMATIQUEMENT", True
-            ),
-            versions_a_compiler=get_list(
-                "COMPILATION_DEFAUT_VERSIONS_A_COMPILER",
-                default=["prof", "eleve"],
-                sep=",",
-            ),
-            versions_accessibles_a_compiler=get_list(
-                "COMPILATION_DEFAUT_VERSIONS_ACCESSIBLES_A_COMPILER",
-                default=[],
-                sep=",",
-            ),
-            est_un_document_a_trous=get_bool(
-                "COMPILATION_DEFAUT_EST_UN_DOCUMENT_A_TROUS", False
-            ),
-            copier_pdf_dans_dossier_cible=get_bool(
-                "COMPILATION_DEFAUT_COPIER_PDF_DANS_DOSSIER_CIBLE", True
-            ),
-            upload=get_bool("COMPILATION_DEFAUT_UPLOAD", True),
-            query_webhook_apres_upload=get_bool(
-                "COMPILATION_DEFAUT_QUERY_WEBHOOK_APRES_UPLOAD", False
-            ),
-            creer_miniature=get_bool("COMPILATION_DEFAUT_CREER_MINIATURE", False),
-            hauteur_miniature=get_int("COMPILATION_DEFAUT_HAUTEUR_MINIATURE", 600),
-            upload_diaporama=get_bool("COMPILATION_DEFAUT_UPLOAD_DIAPORAMA", True),
-            dossier_ftp=get_str("COMPILATION_DEFAUT_DOSSIER_FTP", "/"),
-            # Paramètres de compilation LaTeX
-            latex_nombre_compilations=get_int(
-                "COMPILATION_LATEX_NOMBRE_COMPILATIONS", 2
-            ),
-            latex_compilateur=get_str(
-                "COMPILATION_LATEX_COMPILATEUR", "pdflatex"
-            ),
-            # Compilation
-            affichage_detaille_dans_console=get_bool(
-                "COMPILATION_AFFICHAGE_DETAILLE_DANS_CONSOLE", False
-            ),
-            copier_fichier_version=get_bool("COMPILATION_COPIER_FICHIER_VERSION", True),
-        )
-
-
-@dataclass(frozen=True)
+    def from_env(cls, env: Optional[Mapping[str, str]] = None) -> "CompilationConfig":
+        return _build_from_spec(cls, env)
+
+
+@dataclass(frozen=True, **_SLOTS)
 class OSConfig:
     """Valeurs par défaut pour l'OS, provenant du .env"""
 
@@ -381,6 +458,7 @@ class OSConfig:
     nom_fichier_qrcode: str
     nom_fichier_yaml_poly: str
     extension_fichier_infos_upload: str
+    extension_fichier_cache_metadonnees: str
     extensions_diaporama: list[str]
     suffixe_nom_fichier_prof: str
     suffixe_nom_fichier_a_trous: str
@@ -402,94 +480,131 @@ class OSConfig:
     dossier_poly_backup_yaml: str
     dossier_poly_page_de_garde: str
 
+    _SPEC = (
+        # Fichiers et extensions
+        (
+            "format_nom_fichier",
+            "OS_FORMAT_NOM_FICHIER",
+            "str",
+            "[thematiques.code|upper]-[classe.niveau|upper]-[type_document.initiales|upper]-[titre_ou_titre_activite|slug]",
+        ),
+        (
+            "format_nom_fichier_version",
+            "OS_FORMAT_NOM_FICHIER_VERSION",
+            "str",
+            "@_v[numero_version].ver",
+        ),
+        (
+            "nom_fichier_parametres_compilation",
+            "OS_NOM_FICHIER_PARAMETRES_COMPILATION",
+            "str",
+            "@parametres.pyUPSTIlatex.yaml",
+        ),
+        ("nom_fichier_qrcode", "OS_NOM_FICHIER_QRCODE", "str", "qrcode"),
+        ("nom_fichier_yaml_poly", "OS_NOM_FICHIER_YAML_POLY", "str", "poly.yaml"),
+        (
+            "extension_fichier_infos_upload",
+            "OS_EXTENSION_FICHIER_INFOS_UPLOAD",
+            "str",
+            ".infos.json",
+        ),
+        (
+            "extension_fichier_cache_metadonnees",
+            "OS_FORMAT_EXTENSION_FICHIER_CACHE_METADONNEES",
+            "str",
+            "",
+        ),
+        (
+            "extensions_diaporama",
+            "OS_EXTENSIONS_DIAPORAMA",
+            "list",
+            (".pptx", ".ppt", ".key", ".odp"),
+        ),
+        ("suffixe_nom_fichier_prof", "OS_SUFFIXE_NOM_FICHIER_PROF", "str", "-prof"),
+        (
+            "suffixe_nom_fichier_a_trous",
+            "OS_SUFFIXE_NOM_FICHIER_A_TROUS",
+            "str",
+            "-eleve",
+        ),
+        (
+            "suffixe_nom_fichier_diaporama",
+            "OS_SUFFIXE_NOM_DIAPORAMA",
+            "str",
+            "-diaporama",
+        ),
+        ("suffixe_nom_fichier_sources", "OS_SUFFIXE_NOM_SOURCES", "str", "-sources"),
+        ("suffixe_nom_thumbnail", "OS_SUFFIXE_NOM_THUMBNAIL", "str", "-miniature"),
+        ("suffixe_nom_fichier_poly", "OS_SUFFIXE_NOM_POLY", "str", "-poly"),
+        # Dossiers et arborescence
+        ("dossier_cours", "OS_DOSSIER_COURS", "str", "Cours"),
+        ("dossier_td", "OS_DOSSIER_TD", "str", "TD"),
+        (
+            "dossier_cible_par_rapport_au_fichier_tex",
+            "OS_DOSSIER_CIBLE_PAR_RAPPORT_AU_FICHIER_TEX",
+            "str",
+            "..",
+        ),
+        ("dossier_latex", "OS_DOSSIER_LATEX", "str", "LaTeX"),
+        ("dossier_latex_build", "OS_DOSSIER_LATEX_BUILD", "str", "build"),
+        ("dossier_latex_sources", "OS_DOSSIER_LATEX_SOURCES", "str", "src"),
+        (
+            "dossier_latex_sources_images",
+            "OS_DOSSIER_LATEX_SOURCES_IMAGES",
+            "str",
+            "images",
+        ),
+        ("dossier_tmp_pour_zip", "OS_DOSSIER_TMP_POUR_ZIP", "str", "temp_zip"),
+        ("dossier_poly", "OS_DOSSIER_POLY", "str", "_poly"),
+        ("dossier_poly_backup_yaml", "OS_DOSSIER_POLY_BACKUP_YAML", "str", "_bak"),
+        (
+            "dossier_poly_page_de_garde",
+            "OS_DOSSIER_POLY_PAGE_DE_GARDE",
+            "str",
+            "page_de_garde",
+        ),
+    )
+
     @classmethod
-    def from_env(cls) -> "OSConfig":
-        return cls(
-            # Fichiers et extensions
-            format_nom_fichier=get_str(
-                "OS_FORMAT_NOM_FICHIER",
-                "[thematiques.code|upper]-[classe.niveau|upper]-[type_document.initiales|upper]-[titre_ou_titre_activite|slug]",
-            ),
-            format_nom_fichier_version=get_str(
-                "OS_FORMAT_NOM_FICHIER_VERSION", "@_v[numero_version].ver"
-            ),
-            nom_fichier_parametres_compilation=get_str(
-                "OS_NOM_FICHIER_PARAMETRES_COMPILATION", "@parametres.pyUPSTIlatex.yaml"
-            ),
-            nom_fichier_qrcode=get_str("OS_NOM_FICHIER_QRCODE", "qrcode"),
-            nom_fichier_yaml_poly=get_str("OS_NOM_FICHIER_YAML_POLY", "poly.yaml"),
-            extension_fichier_infos_upload=get_str(
-                "OS_EXTENSION_FICHIER_INFOS_UPLOAD", ".infos.json"
-            ),
-            extensions_diaporama=get_list(
-                "OS_EXTENSIONS_DIAPORAMA",
-                default=[".pptx", ".ppt", ".key", ".odp"],
-                sep=",",
-            ),
-            suffixe_nom_fichier_prof=get_str("OS_SUFFIXE_NOM_FICHIER_PROF", "-prof"),
-            suffixe_nom_fichier_a_trous=get_str(
-                "OS_SUFFIXE_NOM_FICHIER_A_TROUS", "-eleve"
-            ),
-            suffixe_nom_fichier_diaporama=get_str(
-                "OS_SUFFIXE_NOM_DIAPORAMA", "-diaporama"
-            ),
-            suffixe_nom_fichier_sources=get_str("OS_SUFFIXE_NOM_SOURCES", "-sources"),
-            suffixe_nom_thumbnail=get_str("OS_SUFFIXE_NOM_THUMBNAIL", "-miniature"),
-            suffixe_nom_fichier_poly=get_str("OS_SUFFIXE_NOM_POLY", "-poly"),
-            # Dossiers et arborescence
-            dossier_cours=get_str("OS_DOSSIER_COURS", "Cours"),
-            dossier_td=get_str("OS_DOSSIER_TD", "TD"),
-            dossier_cible_par_rapport_au_fichier_tex=get_str(
-                "OS_DOSSIER_CIBLE_PAR_RAPPORT_AU_FICHIER_TEX", ".."
-            ),
-            dossier_latex=get_str("OS_DOSSIER_LATEX", "LaTeX"),
-            dossier_latex_build=get_str("OS_DOSSIER_LATEX_BUILD", "build"),
-            dossier_latex_sources=get_str("OS_DOSSIER_LATEX_SOURCES", "src"),
-            dossier_latex_sources_images=get_str(
-                "OS_DOSSIER_LATEX_SOURCES_IMAGES", "images"
-            ),
-            dossier_tmp_pour_zip=get_str("OS_DOSSIER_TMP_POUR_ZIP", "temp_zip"),
-            dossier_poly=get_str("OS_DOSSIER_POLY", "_poly"),
-            dossier_poly_backup_yaml=get_str("OS_DOSSIER_POLY_BACKUP_YAML", "_bak"),
-            dossier_poly_page_de_garde=get_str(
-                "OS_DOSSIER_POLY_PAGE_DE_GARDE", "page_de_garde"
-            ),
-        )
-
-
-@dataclass(frozen=True)
+    def from_env(cls, env: Optional[Mapping[str, str]] = None) -> "OSConfig":
+        return _build_from_spec(cls, env)
+
+
+@dataclass(frozen=True, **_SLOTS)
 class PolyConfig:
     nombre_de_pages_par_feuille: int
     recto_verso: bool
 
+    _SPEC = (
+        ("nombre_de_pages_par_feuille", "POLY_NOMBRE_DE_PAGES_PAR_FEUILLE", "int", 2),
+        ("recto_verso", "POLY_RECTO_VERSO", "bool", True),
+    )
+
     @classmethod
-    def from_env(cls) -> "PolyConfig":
-        return cls(
-            nombre_de_pages_par_feuille=get_int("POLY_NOMBRE_DE_PAGES_PAR_FEUILLE", 2),
-            recto_verso=get_bool("POLY_RECTO_VERSO", True),
-        )
+    def from_env(cls, env: Optional[Mapping[str, str]] = None) -> "PolyConfig":
+        return _build_from_spec(cls, env)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_SLOTS)
 class TraitementParLotConfig:
     """Valeurs par défaut pour les traitements par lot, provenant du .env"""
 
     dossiers_a_traiter: list[str]
     fichiers_a_exclure: list[str]
 
+    _SPEC = (
+        ("dossiers_a_traiter", "TRAITEMENT_PAR_LOT_DOSSIERS_A_TRAITER", "list", ()),
+        ("fichiers_a_exclure", "TRAITEMENT_PAR_LOT_FICHIERS_A_EXCLURE", "list", ()),
+    )
+
     @classmethod
-    def from_env(cls) -> "TraitementParLotConfig":
-        return cls(
-            dossiers_a_traiter=get_list(
-                "TRAITEMENT_PAR_LOT_DOSSIERS_A_TRAITER", default=[], sep=","
-            ),
-            fichiers_a_exclure=get_list(
-                "TRAITEMENT_PAR_LOT_FICHIERS_A_EXCLURE", default=[], sep=","
-            ),
-        )
-
-
-@dataclass(frozen=True)
+    def from_env(
+        cls, env: Optional[Mapping[str, str]] = None
+    ) -> "TraitementParLotConfig":
+        return _build_from_spec(cls, env)
+
+
+@dataclass(frozen=True, **_SLOTS)
 class FTPConfig:
     """Valeurs par défaut pour la gestion de l'upload, provenant du .env"""
 
@@ -503,22 +618,24 @@ class FTPConfig:
     mode_local: bool
     mode_local_dossier: str
 
+    _SPEC = (
+        ("secret_key", "FTP_SECRET_KEY", "str", "dummy_secret_key"),
+        ("user", "FTP_USER", "str", "ftp_user"),
+        ("password", "FTP_PASSWORD", "str", "ftp_pwd"),
+        ("host", "FTP_HOST", "str", "ftp_host"),
+        ("port", "FTP_PORT", "int", 21),
+        ("timeout", "FTP_TIMEOUT", "int", 30),
+        # Mode local (on remplace le stockage FTP par un stockage local)
+        ("mode_local", "FTP_MODE_LOCAL", "bool", False),
+        ("mode_local_dossier", "FTP_MODE_LOCAL_DOSSIER", "str", ""),
+    )
+
     @classmethod
-    def from_env(cls) -> "FTPConfig":
-        return cls(
-            secret_key=get_str("FTP_SECRET_KEY", "dummy_secret_key"),
-            user=get_str("FTP_USER", "ftp_user"),
-            password=get_str("FTP_PASSWORD", "ftp_pwd"),
-            host=get_str("FTP_HOST", "ftp_host"),
-            port=get_int("FTP_PORT", 21),
-            timeout=get_int("FTP_TIMEOUT", 30),
-            # Mode local (on remplace le stockage FTP par un stockage local)
-            mode_local=get_bool("FTP_MODE_LOCAL", False),
-            mode_local_dossier=get_str("FTP_MODE_LOCAL_DOSSIER", ""),
-        )
-
-
-@dataclass(frozen=True)
+    def from_env(cls, env: Optional[Mapping[str, str]] = None) -> "FTPConfig":
+        return _build_from_spec(cls, env)
+
+
+@dataclass(frozen=True, **_SLOTS)
 class SiteConfig:
     """Valeurs par défaut pour la gestion du site, provenant du .env"""
 
@@ -527,21 +644,29 @@ class SiteConfig:
     webhook_upload_url: str
     document_url_pattern: str
 
+    _SPEC = (
+        ("secret_key", "SITE_SECRET_KEY", "str", "passkey"),
+        (
+            "endpoint_get_config",
+            "SITE_ENDPOINT_GET_CONFIG",
+            "str",
+            "endpoint_get_config",
+        ),
+        ("webhook_upload_url", "SITE_WEBHOOK_UPLOAD_URL", "str", "webhook_upload_url"),
+        (
+            "document_url_pattern",
+            "SITE_DOCUMENT_URL_PATTERN",
+            "str",
+            "document_url_pattern",
+        ),
+    )
+
     @classmethod
-    def from_env(cls) -> "SiteConfig":
-        return cls(
-            secret_key=get_str("SITE_SECRET_KEY", "passkey"),
-            endpoint_get_config=get_str(
-                "SITE_ENDPOINT_GET_CONFIG", "endpoint_get_config"
-            ),
-            webhook_upload_url=get_str("SITE_WEBHOOK_UPLOAD_URL", "webhook_upload_url"),
-            document_url_pattern=get_str(
-                "SITE_DOCUMENT_URL_PATTERN", "document_url_pattern"
-            ),
-        )
-
-
-@dataclass(frozen=True)
+    def from_env(cls, env: Optional[Mapping[str, str]] = None) -> "SiteConfig":
+        return _build_from_spec(cls, env)
+
+
+@dataclass(frozen=True, **_SLOTS)
 class LegacyConfig:
     """Valeurs par défaut pour le legacy, provenant du .env"""
 
@@ -554,53 +679,115 @@ class LegacyConfig:
     dossier_latex_sources: str
     dossier_latex_sources_images: str
 
+    _SPEC = (
+        (
+            "nom_fichier_parametres_compilation",
+            "LEGACY_NOM_FICHIER_PARAMETRES_COMPILATION",
+            "str",
+            "@parametres.upsti.ini",
+        ),
+        ("nom_fichier_xml_poly", "LEGACY_NOM_FICHIER_XML_POLY", "str", "poly.xml"),
+        ("suffixe_nom_fichier_prof", "LEGACY_SUFFIXE_NOM_FICHIER_PROF", "str", "-Prof"),
+        (
+            "suffixe_nom_fichier_a_trous",
+            "LEGACY_SUFFIXE_NOM_FICHIER_A_TROUS",
+            "str",
+            "-Eleve",
+        ),
+        (
+            "suffixe_nom_fichier_diaporama",
+            "LEGACY_SUFFIXE_NOM_DIAPORAMA",
+            "str",
+            "-Diaporama",
+        ),
+        ("suffixe_nom_fichier_poly", "LEGACY_SUFFIXE_NOM_POLY", "str", "-polyTD"),
+        ("dossier_latex_sources", "LEGACY_DOSSIER_LATEX_SOURCES", "str", "Src"),
+        (
+            "dossier_latex_sources_images",
+            "LEGACY_DOSSIER_LATEX_SOURCES_IMAGES",
+            "str",
+            "Images",
+        ),
+    )
+
     @classmethod
-    def from_env(cls) -> "LegacyConfig":
-        return cls(
-            nom_fichier_parametres_compilation=get_str(
-                "LEGACY_NOM_FICHIER_PARAMETRES_COMPILATION", "@parametres.upsti.ini"
-            ),
-            nom_fichier_xml_poly=get_str("LEGACY_NOM_FICHIER_XML_POLY", "poly.xml"),
-            suffixe_nom_fichier_prof=get_str(
-                "LEGACY_SUFFIXE_NOM_FICHIER_PROF", "-Prof"
-            ),
-            suffixe_nom_fichier_a_trous=get_str(
-                "LEGACY_SUFFIXE_NOM_FICHIER_A_TROUS", "-Eleve"
-            ),
-            suffixe_nom_fichier_diaporama=get_str(
-                "LEGACY_SUFFIXE_NOM_DIAPORAMA", "-Diaporama"
-            ),
-            suffixe_nom_fichier_poly=get_str("LEGACY_SUFFIXE_NOM_POLY", "-polyTD"),
-            dossier_latex_sources=get_str("LEGACY_DOSSIER_LATEX_SOURCES", "Src"),
-            dossier_latex_sources_images=get_str(
-                "LEGACY_DOSSIER_LATEX_SOURCES_IMAGES", "Images"
-            ),
-        )
-
-
-@dataclass(frozen=True)
+    def from_env(cls, env: Optional[Mapping[str, str]] = None) -> "LegacyConfig":
+        return _build_from_spec(cls, env)
+
+
 class AppConfig:
-    meta: MetaConfig
-    compilation: CompilationConfig
-    os: OSConfig
-    poly: PolyConfig
-    traitement_par_lot: TraitementParLotConfig
-    ftp: FTPConfig
-    site: SiteConfig
-    legacy: LegacyConfig
+    """Configuration complète, découpée en sections.
+
+    Chaque section est construite à sa première utilisation puis conservée :
+    une commande qui ne lit que cfg.compilation ne construit pas les sections
+    ftp, site, legacy... Les sections sont lues dans un instantané de
+    l'environnement pris à la création (un dict simple plutôt que os.environ,
+    et des sections cohérentes entre elles même si l'environnement change).
+
+    Paramètres
+    ----------
+    env : Mapping[str, str], optional
+        Variables à utiliser. Défaut : copie de os.environ.
+    """
+
+    def __init__(self, env: Optional[Mapping[str, str]] = None):
+        self._env = dict(os.environ) if env is None else env
+
+    @cached_property
+    def meta(self) -> MetaConfig:
+        return MetaConfig.from_env(self._env)
+
+    @cached_property
+    def compilation(self) -> CompilationConfig:
+        return CompilationConfig.from_env(self._env)
+
+    @cached_property
+    def os(self) -> OSConfig:
+        return OSConfig.from_env(self._env)
+
+    @cached_property
+    def poly(self) -> PolyConfig:
+        return PolyConfig.from_env(self._env)
+
+    @cached_property
+    def traitement_par_lot(self) -> TraitementParLotConfig:
+        return TraitementParLotConfig.from_env(self._env)
+
+    @cached_property
+    def ftp(self) -> FTPConfig:
+        return FTPConfig.from_env(self._env)
+
+    @cached_property
+    def site(self) -> SiteConfig:
+        return SiteConfig.from_env(self._env)
+
+    @cached_property
+    def legacy(self) -> LegacyConfig:
+        return LegacyConfig.from_env(self._env)
 
     @classmethod
     def from_env(cls) -> "AppConfig":
-        return cls(
-            meta=MetaConfig.from_env(),
-            compilation=CompilationConfig.from_env(),
-            os=OSConfig.from_env(),
-            poly=PolyConfig.from_env(),
-            traitement_par_lot=TraitementParLotConfig.from_env(),
-            ftp=FTPConfig.from_env(),
-            site=SiteConfig.from_env(),
-            legacy=LegacyConfig.from_env(),
-        )
+        return cls()
+
+
+def _config_files_signature() -> tuple[Optional[int], ...]:
+    """Dates de modification (ns) des fichiers lus par load_config()."""
+    signature = []
+    for path in (_CUSTOM_ENV_PATH, _DEFAULT_CONFIG_PATH, _CUSTOM_CONFIG_PATH):
+        try:
+            signature.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+
+@lru_cache(maxsize=1)
+def _load_config_cached(signature: tuple[Optional[int], ...]) -> AppConfig:
+    # Load TOML configuration and inject into os.environ
+    _load_config_from_toml()
+
+    # Build and return AppConfig from environment
+    return AppConfig.from_env()
 
 
 def load_config() -> AppConfig:
@@ -615,9 +802,13 @@ def load_config() -> AppConfig:
     custom/.env is ONLY for secrets (credentials, API keys).
     Si custom/.env n'existe pas, les valeurs par défaut sont utilisées.
     TOML values always take priority over .env for non-secret keys.
+
+    The result is cached (its sections are frozen, so it can be shared) as
+    long as the modification dates of the three files above do not change:
+    use load_config.cache_clear() to force a reload. Sections are built from
+    the environment on first access.
     """
-    # Load TOML configuration and inject into os.environ
-    _load_config_from_toml()
+    return _load_config_cached(_config_files_signature())
 
-    # Build and return AppConfig from environment
-    return AppConfig.from_env()
+
+load_config.cache_clear = _load_config_cached.cache_clear  # type: ignore[attr-defined]
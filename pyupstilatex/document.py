@@ -1,18 +1,43 @@
+import copy
 import glob
+import hashlib
 import inspect
+import json
+import os
 import shutil
+import sys
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Literal, Optional, Tuple, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
 
 import yaml
 from slugify import slugify
 
 from .accessibilite import VERSIONS_ACCESSIBLES_DISPONIBLES
-from .config import load_config
+from .config import _config_files_signature, load_config
 from .exceptions import CompilationStepError
-from .file_helpers import read_json_config
+from .file_helpers import (
+    JSON_CONFIG_PATH,
+    JSON_CUSTOM_CONFIG_PATH,
+    read_json_config,
+)
 from .file_latex_helpers import parse_package_imports
 from .file_system import DocumentFile
 from .handlers import (
@@ -26,8 +51,36 @@ from .handlers import (
 )
 from .logger import MessageHandler, NoOpMessageHandler
 
+# Chargeur YAML en C (libyaml) si PyYAML a été compilé avec, sinon en Python
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader  # type: ignore
+
+# Cache LRU des documents déjà analysés, indexé par (chemin absolu, mtime_ns,
+# taille) : une nouvelle instance pour un fichier inchangé réutilise le
+# contenu, la version et les métadonnées formatées sans relire le fichier.
+_DOC_CACHE: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+_DOC_CACHE_MAX = 256
+# Protège toutes les lectures et écritures de _DOC_CACHE : des documents sont
+# chargés en parallèle (scan, load_batch...) et move_to_end/popitem ne sont pas
+# atomiques entre eux.
+_DOC_CACHE_LOCK = threading.Lock()
+
+# Métadonnées complétées ensemble par le mode de défaut « batch_pedagogie »
+_BATCH_PEDAGOGIE_KEYS = ("classe", "filiere", "programme", "matiere")
+
+# Message signalant une clé de métadonnée absente de la configuration
+_UNKNOWN_META_KEY_MSG = "Clé de métadonnée inconnue dans le fichier tex: '{}'."
+
+# Marqueur YAML de pyUPSTIlatex v2
+_YAML_MARKER = "%### BEGIN metadonnees_yaml ###"
+
+# Pas de __dict__ par instance quand la version le permet (Python 3.10+)
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 
-@dataclass
+@dataclass(**_SLOTS)
 class UPSTILatexDocument:
     """Représente un document LaTeX UPSTI.
 
@@ -47,6 +100,9 @@ class UPSTILatexDocument:
         Si True, exige que le fichier soit modifiable
     msg : MessageHandler
         Gestionnaire de messages pour l'affichage console/log
+    trusted : bool
+        Si True, le chemin a déjà été validé (ex: par scan_for_documents) et
+        les vérifications d'existence, d'extension et de binaire sont omises
     """
 
     # === CHAMPS PUBLICS ===
@@ -54,6 +110,7 @@ class UPSTILatexDocument:
     strict: bool = False
     require_writable: bool = False
     msg: MessageHandler = field(default_factory=NoOpMessageHandler)
+    trusted: bool = False
 
     # === CHAMPS PRIVÉS (CACHE) ===
     _metadata: Optional[Dict] = field(default=None, init=False)
@@ -70,19 +127,36 @@ class UPSTILatexDocument:
     _liste_fichiers: Dict[str, List[Path]] = field(
         default_factory=lambda: {"compiled": [], "autres": []}, init=False
     )
+    _cache_key: Optional[tuple] = field(default=None, init=False, repr=False)
 
     # =========================================================================
     # MÉTHODES SPÉCIALES
     # =========================================================================
 
     def __post_init__(self):
-        """Initialise l'accès fichier via DocumentFile."""
+        """Initialise l'accès fichier via DocumentFile.
+
+        Si le fichier (inchangé) a déjà été analysé dans ce processus, son
+        contenu est repris depuis le cache des documents.
+        """
         self._file = DocumentFile(
             source=self.source,
             strict=self.strict,
             require_writable=self.require_writable,
+            trusted=self.trusted,
         )
 
+        self._refresh_cache_key()
+        if self._cache_key is None:
+            return
+
+        with _DOC_CACHE_LOCK:
+            entry = _DOC_CACHE.get(self._cache_key)
+            if entry is not None:
+                _DOC_CACHE.move_to_end(self._cache_key)
+                if "raw" in entry:
+                    self._file._raw = entry["raw"]
+
     # =========================================================================
     # MÉTHODES DE CLASSE
     # =========================================================================
@@ -233,7 +307,30 @@ class UPSTILatexDocument:
         strict: bool = False,
         require_writable: bool = False,
         msg: Optional[MessageHandler] = None,
+        trusted: bool = False,
     ) -> tuple["UPSTILatexDocument", List[List[str]]]:
+        """Charge un document existant à partir de son chemin.
+
+        Paramètres
+        ----------
+        path : str
+            Chemin du fichier .tex.
+        strict : bool, optional
+            Si True, lève des exceptions en cas d'erreur. Défaut : False.
+        require_writable : bool, optional
+            Si True, exige que le fichier soit modifiable. Défaut : False.
+        msg : Optional[MessageHandler], optional
+            Gestionnaire de messages. Défaut : NoOpMessageHandler.
+        trusted : bool, optional
+            Si True, le chemin provient d'une source déjà validée (ex:
+            scan_for_documents) : les vérifications d'existence, d'extension
+            et de fichier binaire sont omises. Défaut : False.
+
+        Retourne
+        --------
+        tuple["UPSTILatexDocument", List[List[str]]]
+            (document, messages) où document est None en cas d'erreur.
+        """
         errors: List[List[str]] = []
         try:
             doc = cls(
@@ -241,6 +338,7 @@ class UPSTILatexDocument:
                 strict=strict,
                 require_writable=require_writable,
                 msg=(msg or NoOpMessageHandler()),
+                trusted=trusted,
             )
             return doc, errors
         except Exception as e:
@@ -252,6 +350,150 @@ class UPSTILatexDocument:
             )
             return None, errors
 
+    @classmethod
+    def load_batch(
+        cls,
+        paths: List[str],
+        *,
+        msg: Optional[MessageHandler] = None,
+        trusted: bool = False,
+        max_workers: Optional[int] = None,
+    ) -> List[tuple[Optional["UPSTILatexDocument"], List[List[str]]]]:
+        """Charge plusieurs documents en parallèle.
+
+        La configuration JSON, les validateurs de métadonnées et les valeurs
+        par défaut sont préparés une seule fois, avant le lancement des
+        threads. Chaque document est ensuite instancié, lu, et sa version
+        détectée (cache partagé) dans un pool de threads.
+
+        Les métadonnées ne sont pas formatées ici : get_metadata() et
+        get_version() restent appelés par l'utilisateur du document et
+        renvoient leurs messages comme d'habitude.
+
+        Paramètres
+        ----------
+        paths : List[str]
+            Chemins des fichiers .tex.
+        msg : Optional[MessageHandler], optional
+            Gestionnaire de messages partagé. Défaut : NoOpMessageHandler.
+        trusted : bool, optional
+            Voir from_path(). Défaut : False.
+        max_workers : Optional[int], optional
+            Nombre de threads. Défaut : min(8, 2 × nombre de CPU).
+
+        Retourne
+        --------
+        List[tuple[Optional["UPSTILatexDocument"], List[List[str]]]]
+            Un couple (document, messages) par chemin, dans l'ordre de paths.
+        """
+        cfg, _ = read_json_config()
+        if cfg is not None:
+            _compile_meta_cfg(cfg)
+        _get_default_metadata()
+
+        def charge(path: str):
+            doc, errors = cls.from_path(path, msg=msg, trusted=trusted)
+            if doc is not None and doc.is_readable:
+                try:
+                    doc.content
+                    # Version mémorisée dans le cache partagé des documents,
+                    # où get_version() la retrouvera
+                    version, _ = doc._detect_version()
+                    if version is not None:
+                        doc._doc_cache_set(version=dict(version))
+                except Exception:
+                    # Les erreurs seront signalées par get_version()
+                    pass
+            return doc, errors
+
+        if max_workers is None:
+            max_workers = min(8, (os.cpu_count() or 1) * 2)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(charge, paths))
+
+    @classmethod
+    def compile_batch(
+        cls,
+        paths: List[str],
+        mode: str = "normal",
+        *,
+        dry_run: bool = False,
+        max_workers: Optional[int] = None,
+    ) -> List[tuple[Optional[str], List[List[str]]]]:
+        """Compile plusieurs documents en parallèle (processus séparés).
+
+        Les documents d'un même dossier partagent le fichier de paramètres,
+        le dossier de compilation et le dossier temporaire du zip : ils sont
+        compilés à la suite par un même processus. Les dossiers différents
+        sont répartis entre les processus.
+
+        Les compilations se font sans affichage (verbose="silent") : seuls
+        les messages retournés permettent de suivre le résultat. Les documents
+        sont instanciés avec la classe appelante (cls), par exemple une classe
+        personnalisée de custom/document.py.
+
+        Paramètres
+        ----------
+        paths : List[str]
+            Chemins des fichiers .tex.
+        mode : str, optional
+            Mode de compilation (voir compile()). Défaut : "normal".
+        dry_run : bool, optional
+            Voir compile(). Défaut : False.
+        max_workers : Optional[int], optional
+            Nombre de processus. Défaut : nombre de CPU.
+
+        Retourne
+        --------
+        List[tuple[Optional[str], List[List[str]]]]
+            Un couple (statut, messages) par chemin, dans l'ordre de paths.
+        """
+        from concurrent.futures import ProcessPoolExecutor
+
+        from .document_registry import get_document_class
+
+        # La classe de custom/document.py n'est pas importable par son nom dans
+        # un processus lancé par « spawn » : elle est alors retrouvée par le
+        # registre dans le processus de compilation (None)
+        document_class = None if cls is get_document_class() else cls
+
+        groupes: Dict[str, List[int]] = {}
+        for i, path in enumerate(paths):
+            dossier = os.path.dirname(os.path.abspath(path))
+            groupes.setdefault(dossier, []).append(i)
+
+        resultats: List[tuple[Optional[str], List[List[str]]]] = [
+            (None, []) for _ in paths
+        ]
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(
+                    _compile_group,
+                    document_class,
+                    [paths[i] for i in indices],
+                    mode,
+                    dry_run,
+                ): indices
+                for indices in groupes.values()
+            }
+            for future, indices in futures.items():
+                try:
+                    resultats_groupe = future.result()
+                except Exception as e:
+                    resultats_groupe = [
+                        ("error", [[f"Erreur lors de la compilation : {e}", "error"]])
+                        for _ in indices
+                    ]
+                for i, resultat in zip(indices, resultats_groupe):
+                    resultats[i] = resultat
+        return resultats
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Vide les caches de documents partagés entre les instances."""
+        with _DOC_CACHE_LOCK:
+            _DOC_CACHE.clear()
+
     # =========================================================================
     # PROPERTIES (ACCÈS AUX ATTRIBUTS CACHED)
     # =========================================================================
@@ -302,6 +544,8 @@ class UPSTILatexDocument:
         Note : Le contenu n'est pas écrit sur disque tant que save() n'est pas appelé.
         """
         self.file._raw = value
+        # Le contenu ne correspond plus au fichier sur disque
+        self._cache_key = None
 
     # --- Properties avec cache automatique ---
 
@@ -389,95 +633,106 @@ class UPSTILatexDocument:
             if compilation_cli_options["verbose"] in ["normal"]:
                 self.msg.titre2("Préparation de la compilation")
 
-            # === 1- Vérification de l'intégrité du fichier ===
-            resultat, messages = self._cp_step(
-                mode_ok=["deep", "normal", "quick"],
-                affichage="Vérification de l'intégrité du fichier",
-                fonction=lambda: self.file.check_file("read"),
-                compilation_options=compilation_cli_options,
-            )
-            messages_compilation.extend(messages)
-
-            # === 2- Vérification de la version ===
-            resultat, messages = self._cp_step(
-                mode_ok=["deep", "normal", "quick"],
-                affichage="Détection de la version du document",
-                fonction=lambda: self.get_version(check_compatibilite=True),
-                compilation_options=compilation_cli_options,
-            )
-            messages_compilation.extend(messages)
-
-            # === 3- Lecture des paramètres de compilation ===
-            resultat, messages = self._cp_step(
-                mode_ok=["deep", "normal", "quick"],
-                affichage="Lecture des paramètres de compilation",
-                fonction=lambda: self._cp_get_compilation_parameters(
+            # Lecture des paramètres de compilation, mis en cache (y compris
+            # les overrides) pour les étapes suivantes
+            def lire_parametres():
+                resultat, messages = self._cp_get_compilation_parameters(
                     override_compilation_params
-                ),
-                compilation_options=compilation_cli_options,
-            )
-            messages_compilation.extend(messages)
-
-            # Mettre à jour le cache avec les paramètres (y compris les overrides)
-            if resultat is not None:
-                self._compilation_parameters = resultat
-
-            # === 4- Lecture des métadonnées ===
-            resultat, messages = self._cp_step(
-                affichage="Lecture des métadonnées du fichier tex",
-                fonction=self.get_metadata,
-                compilation_options=compilation_cli_options,
-            )
-            messages_compilation.extend(messages)
-
-            # === 5- Vérification et changement de l'id unique du document ===
-            resultat, messages = self._cp_step(
-                affichage="Vérification de l'id unique du document",
-                fonction=self._cp_check_id_unique,
-                compilation_options=compilation_cli_options,
-            )
-            messages_compilation.extend(messages)
-
-            # === 6- Vérification et changement du nom du fichier ===
-            if self.compilation_parameters.get("renommer_automatiquement", False):
-                resultat, messages = self._cp_step(
-                    mode_ok=["deep"],
-                    affichage="Vérification du nom de fichier",
-                    fonction=self._cp_rename_file,
-                    compilation_options=compilation_cli_options,
                 )
-                messages_compilation.extend(messages)
-
-            # === 7- Générer le QRCode ===
-            resultat, messages = self._cp_step(
-                mode_ok=["deep"],
-                affichage="Génération du QR code du document",
-                fonction=self._cp_generate_qrcode,
-                compilation_options=compilation_cli_options,
-            )
-            messages_compilation.extend(messages)
-
-            # === 8- Générer le code latex à partir des métadonnées ===
-            if self.version == "upsti-latex":
-                resultat, messages = self._cp_step(
-                    mode_ok=["deep"],
-                    affichage="Génération du code latex à partir des métadonnées",
-                    fonction=self._cp_generate_latex_template,
-                    compilation_options=compilation_cli_options,
+                if resultat is not None:
+                    self._compilation_parameters = resultat
+                return resultat, messages
+
+            # Étapes de préparation : (condition, modes, affichage, fonction).
+            # La condition est évaluée juste avant l'étape : elle peut dépendre
+            # de la version ou des paramètres lus par les étapes précédentes.
+            def toujours():
+                return True
+
+            def est_upsti_latex():
+                return self.version == "upsti-latex"
+
+            def renommer():
+                return self.compilation_parameters.get(
+                    "renommer_automatiquement", False
                 )
-                messages_compilation.extend(messages)
 
-            # === 9- Générer le fichier UPSTI_Document (si upsti-latex) ===
-            if self.version == "upsti-latex":
-                resultat, messages = self._cp_step(
-                    affichage=(
-                        "Création du fichier tex UPSTI_Document "
-                        "(pour la rétrocompatibilité)"
-                    ),
-                    fonction=self._cp_generate_UPSTI_Document_tex_file,
-                    compilation_options=compilation_cli_options,
-                )
-                messages_compilation.extend(messages)
+            tous_modes = ["deep", "normal", "quick"]
+            etapes_preparation = (
+                # === 1- Vérification de l'intégrité du fichier ===
+                (
+                    toujours,
+                    tous_modes,
+                    "Vérification de l'intégrité du fichier",
+                    lambda: self.file.check_file("read"),
+                ),
+                # === 2- Vérification de la version ===
+                (
+                    toujours,
+                    tous_modes,
+                    "Détection de la version du document",
+                    lambda: self.get_version(check_compatibilite=True),
+                ),
+                # === 3- Lecture des paramètres de compilation ===
+                (
+                    toujours,
+                    tous_modes,
+                    "Lecture des paramètres de compilation",
+                    lire_parametres,
+                ),
+                # === 4- Lecture des métadonnées ===
+                (
+                    toujours,
+                    ["deep", "normal"],
+                    "Lecture des métadonnées du fichier tex",
+                    self.get_metadata,
+                ),
+                # === 5- Vérification et changement de l'id unique du document ===
+                (
+                    toujours,
+                    ["deep", "normal"],
+                    "Vérification de l'id unique du document",
+                    self._cp_check_id_unique,
+                ),
+                # === 6- Vérification et changement du nom du fichier ===
+                (
+                    renommer,
+                    ["deep"],
+                    "Vérification du nom de fichier",
+                    self._cp_rename_file,
+                ),
+                # === 7- Générer le QRCode ===
+                (
+                    toujours,
+                    ["deep"],
+                    "Génération du QR code du document",
+                    self._cp_generate_qrcode,
+                ),
+                # === 8- Générer le code latex à partir des métadonnées ===
+                (
+                    est_upsti_latex,
+                    ["deep"],
+                    "Génération du code latex à partir des métadonnées",
+                    self._cp_generate_latex_template,
+                ),
+                # === 9- Générer le fichier UPSTI_Document (si upsti-latex) ===
+                (
+                    est_upsti_latex,
+                    ["deep", "normal"],
+                    "Création du fichier tex UPSTI_Document "
+                    "(pour la rétrocompatibilité)",
+                    self._cp_generate_UPSTI_Document_tex_file,
+                ),
+            )
+            for condition, mode_ok, affichage, fonction in etapes_preparation:
+                if condition():
+                    _, messages = self._cp_step(
+                        mode_ok=mode_ok,
+                        affichage=affichage,
+                        fonction=fonction,
+                        compilation_options=compilation_cli_options,
+                    )
+                    messages_compilation.extend(messages)
 
             # Affichage titre intermédiaire
             if compilation_cli_options["verbose"] in ["normal"]:
@@ -716,6 +971,41 @@ class UPSTILatexDocument:
         if self._metadata is not None:
             return self._metadata, []
 
+        # Réutiliser le cache partagé si le fichier (et le fichier de
+        # paramètres) n'ont pas changé depuis la dernière analyse, et si la
+        # configuration utilisée pour le formatage n'a pas été rechargée.
+        # L'entrée du cache est partagée : chaque document en reçoit une copie.
+        cached = self._doc_cache_get("metadata")
+        parametres_mtime = self._parametres_mtime_ns()
+        contexte = _metadata_config_context()
+        if (
+            cached is not None
+            and cached[2] == parametres_mtime
+            and cached[3][0] is contexte[0]
+            and cached[3][1] is contexte[1]
+        ):
+            self._metadata = copy.deepcopy(cached[0])
+            return self._metadata, [list(e) for e in cached[1]]
+
+        # Réutiliser le cache disque (si activé) si le contenu du fichier et
+        # la configuration n'ont pas changé depuis la dernière écriture
+        fichier_cache = self._metadata_cache_file()
+        empreinte = None
+        if fichier_cache is not None:
+            empreinte = self._metadata_cache_signature(parametres_mtime)
+            cached = self._metadata_cache_load(fichier_cache, empreinte)
+            if cached is not None:
+                self._metadata = cached[0]
+                self._doc_cache_set(
+                    metadata=(
+                        cached[0],
+                        cached[1],
+                        parametres_mtime,
+                        _metadata_config_context(),
+                    )
+                )
+                return self._metadata, [list(e) for e in cached[1]]
+
         # Déléguer le parsing au handler approprié selon la version
         try:
             metadata, errors = self._get_pyupstilatex_handler().parse_metadata()
@@ -754,10 +1044,23 @@ class UPSTILatexDocument:
         # Récupérer la version pour _format_metadata
         version = self._version or self.version
         formatted, formatted_errors = self._format_metadata(metadata, source=version)
+        # Messages [message, flag] pour l'appelant (tuples dans _format_metadata)
+        errors.extend(list(e) for e in formatted_errors)
         if formatted is not None:
+            # Stocké sans copie : self._metadata n'est jamais modifié en place
             self._metadata = formatted
+            self._doc_cache_set(
+                metadata=(
+                    formatted,
+                    [list(e) for e in errors],
+                    parametres_mtime,
+                    _metadata_config_context(),
+                )
+            )
+            if empreinte is not None:
+                self._metadata_cache_save(fichier_cache, empreinte, formatted, errors)
 
-        return formatted, errors + formatted_errors
+        return formatted, errors
 
     def get_compilation_parameters(
         self, override_params: Optional[Dict] = None
@@ -874,7 +1177,11 @@ class UPSTILatexDocument:
             # Version déjà détectée (cache)
             return self._version, []
 
-        version, errors = self._detect_version()
+        cached = self._doc_cache_get("version")
+        if cached is not None:
+            version, errors = dict(cached), []
+        else:
+            version, errors = self._detect_version()
 
         if version is None:
             return None, errors
@@ -896,6 +1203,8 @@ class UPSTILatexDocument:
                 ]
 
         self._version = version
+        if cached is None:
+            self._doc_cache_set(version=dict(version))
         return version, errors
 
     def get_metadata_value(
@@ -1047,9 +1356,14 @@ class UPSTILatexDocument:
         tuple[bool, List[List[str]]]
             (succès, messages)
         """
-        success, messages = self.file.write(self.content, encoding)
+        contenu = self.content
+        success, messages = self.file.write(contenu, encoding)
 
         if success:
+            # Le fichier correspond de nouveau au contenu en mémoire : inutile
+            # de le relire
+            self.file._raw = contenu
+            self._refresh_cache_key()
             self.msg.success(f"Fichier sauvegardé : {self.source}")
 
         return success, messages
@@ -1527,12 +1841,16 @@ class UPSTILatexDocument:
 
         # === 9. Mise à jour de l'objet Document pour pointer vers le nouveau chemin ===
         try:
+            contenu = self._file._raw if self._file is not None else None
             self.source = str(nouveau_chemin)
             self._file = DocumentFile(
                 source=self.source,
                 strict=self.strict,
                 require_writable=self.require_writable,
             )
+            # Le renommage ne change pas le contenu : inutile de le relire
+            self._file._raw = contenu
+            self._refresh_cache_key()
         except Exception:
             # Si la reconstruction de l'objet DocumentFile échoue, signaler une erreur
             return chemin_actuel.name, [
@@ -1632,7 +1950,7 @@ class UPSTILatexDocument:
         """
         # Récupération de la configuration
         cfg = load_config()
-        pattern = cfg.site.document_url_pattern or ""
+        pattern = cfg.site.document_url_pattern
 
         if not pattern:
             return None, [
@@ -1758,9 +2076,16 @@ class UPSTILatexDocument:
 
                 nouvel_id_unique = f"{prefixe_id_unique}{epoch}"
 
-                # Mise à jour du cache des métadonnées
+                # Mise à jour du cache des métadonnées (sans modification en
+                # place : le dictionnaire peut être partagé avec _DOC_CACHE)
                 if self._metadata is not None:
-                    self._metadata["id_unique"]["valeur"] = nouvel_id_unique
+                    self._metadata = {
+                        **self._metadata,
+                        "id_unique": {
+                            **self._metadata["id_unique"],
+                            "valeur": nouvel_id_unique,
+                        },
+                    }
 
                 # Il faut écrire le nouvel id dans le fichier tex
                 if not compilation_options["dry_run"]:
@@ -2668,6 +2993,156 @@ class UPSTILatexDocument:
     # MÉTHODES PRIVÉES : HELPERS ET UTILITAIRES
     # =========================================================================
 
+    def invalidate(self) -> None:
+        """Oublie tout ce qui a été lu ou calculé à partir du fichier.
+
+        À appeler si le fichier a été modifié sur disque par un autre moyen que
+        save() : le contenu, la version, les métadonnées et les paramètres de
+        compilation (y compris ceux forcés) seront relus au prochain accès.
+        """
+        if self._file is not None:
+            self._file._raw = None
+        self._metadata = None
+        self._version = None
+        self._compilation_parameters = None
+        self._pyupstilatex_handler = None
+        self._latex_handler = None
+        self._refresh_cache_key()
+
+    def _refresh_cache_key(self) -> None:
+        """Recalcule la clé du cache partagé des documents à partir du fichier."""
+        try:
+            st = os.stat(self.source)
+        except (OSError, ValueError):
+            self._cache_key = None
+            return
+        self._cache_key = (os.path.abspath(self.source), st.st_mtime_ns, st.st_size)
+
+    def _doc_cache_get(self, champ: str) -> Any:
+        """Retourne une valeur du cache partagé des documents, ou None."""
+        if self._cache_key is None:
+            return None
+        with _DOC_CACHE_LOCK:
+            entry = _DOC_CACHE.get(self._cache_key)
+            return None if entry is None else entry.get(champ)
+
+    def _doc_cache_set(self, **valeurs: Any) -> None:
+        """Enregistre des valeurs dans le cache partagé des documents.
+
+        Le contenu brut lu sur disque est mémorisé en même temps. Les entrées
+        les plus anciennes sont évincées au-delà de _DOC_CACHE_MAX.
+        """
+        if self._cache_key is None or self._file is None:
+            return
+        with _DOC_CACHE_LOCK:
+            entry = _DOC_CACHE.setdefault(self._cache_key, {})
+            _DOC_CACHE.move_to_end(self._cache_key)
+            if self._file._raw is not None:
+                entry["raw"] = self._file._raw
+            entry.update(valeurs)
+            while len(_DOC_CACHE) > _DOC_CACHE_MAX:
+                _DOC_CACHE.popitem(last=False)
+
+    def _metadata_cache_file(self) -> Optional[Path]:
+        """Chemin du cache disque des métadonnées (None si désactivé).
+
+        Le cache n'est utilisé que pour un document lu tel quel sur disque
+        (pas de contenu modifié en mémoire).
+        """
+        if self._file is None or self._cache_key is None:
+            return None
+        extension = load_config().os.extension_fichier_cache_metadonnees
+        if not extension:
+            return None
+        return self.file.parent / (str(self.file.stem) + extension)
+
+    def _metadata_cache_signature(
+        self, parametres_mtime: Optional[int]
+    ) -> Optional[str]:
+        """Empreinte du fichier source et de la configuration utilisée.
+
+        Hash du contenu du fichier, complété par les dates de modification du
+        fichier de paramètres, des fichiers de configuration (TOML, JSON), de
+        ce module et de custom/document.py, ainsi que par les valeurs par
+        défaut des métadonnées (qui peuvent venir de variables
+        d'environnement). None si le fichier ne peut pas être lu.
+        """
+        from .document_registry import _CUSTOM_MODULE_PATH
+
+        try:
+            with open(self.source, "rb") as f:
+                h = hashlib.blake2b(f.read(), digest_size=16)
+        except OSError:
+            return None
+
+        contexte: List[Any] = [parametres_mtime]
+        contexte.extend(_config_files_signature())
+        for path in (
+            JSON_CONFIG_PATH,
+            JSON_CUSTOM_CONFIG_PATH,
+            __file__,
+            _CUSTOM_MODULE_PATH,
+        ):
+            try:
+                contexte.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                contexte.append(None)
+        contexte.append(sorted(_get_default_metadata().items()))
+        contexte.append(load_config().meta.id_document_prefixe)
+        h.update(repr(contexte).encode())
+        return h.hexdigest()
+
+    @staticmethod
+    def _metadata_cache_load(
+        fichier_cache: Path, empreinte: Optional[str]
+    ) -> Optional[tuple[Dict, List[List[str]]]]:
+        """Lit le cache disque des métadonnées, ou None s'il n'est pas à jour."""
+        if empreinte is None:
+            return None
+        try:
+            with open(fichier_cache, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (
+            not isinstance(cache, dict)
+            or cache.get("hash") != empreinte
+            or not isinstance(cache.get("data"), dict)
+            or not isinstance(cache.get("messages"), list)
+        ):
+            return None
+        return cache["data"], cache["messages"]
+
+    @staticmethod
+    def _metadata_cache_save(
+        fichier_cache: Path,
+        empreinte: str,
+        metadata: Dict,
+        messages: List[List[str]],
+    ) -> None:
+        """Écrit le cache disque des métadonnées (erreurs ignorées)."""
+        try:
+            with open(fichier_cache, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"hash": empreinte, "data": metadata, "messages": messages},
+                    f,
+                    ensure_ascii=False,
+                )
+        except (OSError, TypeError, ValueError):
+            pass
+
+    def _parametres_mtime_ns(self) -> Optional[int]:
+        """Date de modification du fichier de paramètres (None si absent)."""
+        if self._file is None:
+            return None
+        cfg = load_config()
+        try:
+            return os.stat(
+                self.file.parent / cfg.os.nom_fichier_parametres_compilation
+            ).st_mtime_ns
+        except (OSError, ValueError):
+            return None
+
     @classmethod
     def _create_bare_instance(
         cls,
@@ -2706,6 +3181,7 @@ class UPSTILatexDocument:
         instance.strict = strict
         instance.require_writable = require_writable
         instance.msg = msg or NoOpMessageHandler()
+        instance.trusted = False
         instance._metadata = None
         instance._compilation_parameters = None
         instance._version = version
@@ -2713,6 +3189,7 @@ class UPSTILatexDocument:
         instance._pyupstilatex_handler = None
         instance._latex_handler = None
         instance._liste_fichiers = {"compiled": [], "autres": []}
+        instance._cache_key = None
         return instance
 
     def _read_fichier_parametres_compilation(
@@ -2747,7 +3224,7 @@ class UPSTILatexDocument:
         # Lire et parser le fichier YAML
         try:
             with open(fichier_path, "r", encoding="utf-8") as f:
-                custom_params = yaml.safe_load(f)
+                custom_params = yaml.load(f, Loader=_SafeLoader)
                 if not isinstance(custom_params, dict):
                     return None, [
                         [
@@ -2792,6 +3269,17 @@ class UPSTILatexDocument:
         """
         version: Dict[str, Optional[int | str]] = {}
 
+        # Cas courant (v2 + upsti-latex) : les deux marqueurs sont en tête de
+        # document, inutile de charger tout le fichier
+        try:
+            entete = self.file.read_head()
+        except Exception:
+            entete = ""
+        if _has_yaml_marker(entete) and "upsti-latex" in parse_package_imports(
+            entete
+        ):
+            return {"pyupstilatex": 2, "latex": "upsti-latex"}, []
+
         try:
             content = self.content
             packages = parse_package_imports(content)
@@ -2799,17 +3287,10 @@ class UPSTILatexDocument:
             # === Détection de la version de pyUPSTIlatex ===
 
             # v2 : présence du marqueur de métadonnées YAML dans les commentaires
-            for line in content.splitlines():
-                stripped = line.strip()
-                if not stripped:
-                    continue
-                if stripped.startswith("%") and not stripped.startswith("%%"):
-                    if "%### BEGIN metadonnees_yaml ###" in stripped:
-                        version["pyupstilatex"] = 2
-                        break
-
             # v1 / None : si pas de marqueur YAML
-            if "pyupstilatex" not in version:
+            if _has_yaml_marker(content):
+                version["pyupstilatex"] = 2
+            else:
                 version["pyupstilatex"] = 1 if "UPSTI_Document" in packages else None
 
             # === Détection du package LaTeX utilisé ===
@@ -2828,37 +3309,13 @@ class UPSTILatexDocument:
 
         return version, []
 
-    def _get_default_metadata(self) -> Tuple[Dict, List[List[str]]]:
-        """Retourne les métadonnées par défaut (méthode interne).
-
-        Retourne (dict Python, liste de messages d'erreurs (msg, flag)).
-        """
-        default_metadata: Dict[str, Dict] = {}
-        errors: List[Tuple[str, str]] = []
-
-        # On prépare toutes les valeurs par défaut globales (via config .env)
-        epoch = int(time.time())
-        cfg_env = load_config()
-        meta_cfg = cfg_env.meta
-
-        default_metadata = {
-            "id_unique": f"{meta_cfg.id_document_prefixe}{epoch}",
-            "variante": meta_cfg.variante,
-            "matiere": meta_cfg.matiere,
-            "classe": meta_cfg.classe,
-            "type_document": meta_cfg.type_document,
-            "titre": meta_cfg.titre,
-            "version": meta_cfg.version,
-            "auteur": meta_cfg.auteur,
-        }
-        return default_metadata, errors
-
     def _format_metadata(
         self, data: Dict, *, source: str
-    ) -> Tuple[Dict, List[List[str]]]:
+    ) -> Tuple[Optional[Dict], List[Tuple[str, str]]]:
         """Nettoie/normalise les métadonnées parsées avant mise en cache et retour.
 
-        Retourne (dict Python, liste de messages d'erreurs (msg, flag)).
+        Retourne (dict Python, liste de messages d'erreurs (msg, flag)). Les
+        messages sont des tuples : get_metadata les convertit en listes.
         """
         if data is None:
             data = {}
@@ -2869,522 +3326,204 @@ class UPSTILatexDocument:
         if cfg_errors:
             return None, cfg_errors
 
-        cfg_meta = cfg.get("metadonnee") or {}
+        meta_cfg_compile = _compile_meta_cfg(cfg)
 
-        # On prépare toutes les valeurs par défaut globales
-        valeurs_par_defaut, erreurs_default = self._get_default_metadata()
-        errors.extend(erreurs_default)
+        # Valeurs par défaut globales (via config .env, mises en cache)
+        valeurs_par_defaut = _get_default_metadata()
 
-        # Préparation des champs déclarés et par défaut
-        for key, meta in cfg_meta.items():
-            params = meta.get("parametres", {})
-            if key not in data and not params.get("default"):
+        # Préparation des champs déclarés et par défaut, à partir des modèles
+        # précalculés une fois par configuration
+        for key, modele, a_defaut in meta_cfg_compile["schema"]:
+            if key in data:
+                valeur = data[key]
+            elif a_defaut:
+                valeur = ""
+            else:
                 continue
 
-            meta_ok[key] = {
-                "label": meta.get("label", "Erreur"),
-                "description": meta.get("description", "Erreur"),
-                "valeur": "",
-                "affichage": "",
-                "initiales": "",
-                "raw_value": data.get(key, "") if data else "",
-                "initial_value": data.get(key, "") if data else "",
-                "parametres": params,
-                **(
-                    {"type_meta": "default"}
-                    if params.get("default") and key not in data
-                    else {}
-                ),
-            }
+            meta = modele.copy()
+            meta["raw_value"] = valeur
+            meta["initial_value"] = valeur
+            if key not in data:
+                meta["type_meta"] = "default"
+            meta_ok[key] = meta
 
         # 1. On vérifie s'il y a des champs surnuméraires définis par mégarde
-        for key in data:
-            if key not in cfg_meta:
-                errors.append(
-                    [
-                        f"Clé de métadonnée inconnue dans le fichier tex: '{key}'.",
-                        "warning",
-                    ]
-                )
-
-        # 2. On verifie la correspondance des types de données
+        # (dans l'ordre du fichier tex)
+        cles_inconnues = data.keys() - meta_cfg_compile["cles"]
+        if cles_inconnues:
+            for key in data:
+                if key in cles_inconnues:
+                    errors.append((_UNKNOWN_META_KEY_MSG.format(key), "warning"))
+
+        # 2 à 5. Vérifications de chaque métadonnée, en une seule passe sur
+        # meta_ok (validateurs, types et déclarations précompilés une fois par
+        # configuration). Les messages de chaque vérification sont collectés à
+        # part puis ajoutés dans l'ordre des vérifications.
+        types_acceptes = meta_cfg_compile["types"]
+        validateurs = meta_cfg_compile["validateurs"]
+        declarations = meta_cfg_compile["declarations"]
+        jointures = meta_cfg_compile["jointures"]
+        parametres = meta_cfg_compile["parametres"]
+        errors_types: List[Tuple[str, str]] = []
+        errors_regles: List[Tuple[str, str]] = []
+        errors_custom: List[Tuple[str, str]] = []
+        errors_relations: List[Tuple[str, str]] = []
         for key, meta in meta_ok.items():
-            params = meta.get("parametres", {})
-            types_to_check = params.get("accepted_types", [])
-            raw_value = meta.get("raw_value", "")
-
-            if check_types(raw_value, types_to_check):
-                continue
-
-            use_default = bool(params.get("default"))
-            self._handle_invalid_meta(
-                meta,
-                key,
-                f"'{key}' devrait être de type {types_to_check}.",
-                use_default,
-                errors,
-                suffix="wrong_type",
-            )
-
-        # 3. On vérifie les contraintes spécifiques à certains champs TOCHK
-        for key, meta in meta_ok.items():
-            params = meta.get("parametres", {})
-            rules = params.get("validate_rules", {})
-            raw_value = meta.get("raw_value", {})
-
-            if not rules:
-                continue
-
-            use_default = bool(params.get("default"))
-
-            # Règle : dict_keys - les clés doivent être dans une liste définie TOCHK
-            if "dict_keys" in rules and isinstance(raw_value, dict):
-                allowed_keys = set(rules["dict_keys"])
-                actual_keys = set(raw_value.keys())
-                invalid_keys = actual_keys - allowed_keys
-                if invalid_keys:
-                    self._handle_invalid_meta(
-                        meta,
-                        key,
-                        f"Clé(s) non autorisée(s) pour '{key}': {list(invalid_keys)}.",
-                        use_default,
-                        errors,
-                        suffix="validate_rules",
-                    )
-
-            # Règle : keys_in - les clés doivent appartenir aux clés d'un modèle TOCHK
-            if "keys_in" in rules and isinstance(raw_value, dict):
-                path = str(rules["keys_in"]).split(".")
-                source = cfg
-                for p in path:
-                    source = source.get(p, {})
-                allowed_keys = set(source.keys())
-                actual_keys = set(raw_value.keys())
-
-                invalid_keys = actual_keys - allowed_keys
-                if invalid_keys:
-                    self._handle_invalid_meta(
-                        meta,
-                        key,
-                        f"Clé(s) non autorisée(s) pour '{key}': {list(invalid_keys)}.",
-                        use_default,
-                        errors,
-                        suffix="validate_rules",
-                    )
-
-            # Règle : value_type - les valeurs des différentes clés doivent être typées
-            if "value_type" in rules and isinstance(raw_value, dict):
-                types_to_check = rules["value_type"]
-                if not isinstance(types_to_check, list):
-                    types_to_check = [types_to_check]
-
-                invalid_values = [
-                    v for v in raw_value.values() if not check_types(v, types_to_check)
-                ]
+            meta_params = parametres[key]
+            use_default = meta_params.use_default
+
+            # 2. On verifie la correspondance des types de données
+            if not isinstance(meta["raw_value"], types_acceptes[key]):
+                self._handle_invalid_meta(
+                    meta,
+                    key,
+                    f"'{key}' devrait être de type {meta_params.accepted_types}.",
+                    use_default,
+                    errors_types,
+                    suffix="wrong_type",
+                )
 
-                if invalid_values:
-                    reason = (
-                        f"Les valeurs de '{key}' doivent être de type "
-                        f"{types_to_check}."
-                    )
+            # 3. On vérifie les contraintes spécifiques à certains champs TOCHK
+            valider = validateurs.get(key)
+            if valider is not None:
+                for reason in valider(meta):
                     self._handle_invalid_meta(
                         meta,
                         key,
                         reason,
                         use_default,
-                        errors,
+                        errors_regles,
                         suffix="validate_rules",
                     )
 
-            # Règle : extended_types - vérifie les types d'un dictionnaire hétérogène
-            if "extended_types" in rules and isinstance(raw_value, dict):
-                type_schema = rules["extended_types"]
-                for sub_key, expected_type in type_schema.items():
-                    if sub_key in raw_value:
-                        sub_value = raw_value[sub_key]
-                        if not check_types(sub_value, [expected_type]):
-                            self._handle_invalid_meta(
-                                meta,
-                                key,
-                                f"La clé '{sub_key}' dans '{key}' a un type invalide. "
-                                f"Attendu: {expected_type}, "
-                                f"Reçu: {type(sub_value).__name__}.",
-                                use_default,
-                                errors,
-                                suffix="validate_rules",
-                            )
+            # 4. Gestion des valeurs custom sous forme de dict.
+            raw_value = meta["raw_value"]
+            declaration = declarations.get(key)
+            if declaration is not None and isinstance(raw_value, dict):
+                declaration_parsed, expected_keys, expected_classes = declaration
 
-            # Règle : sum - valeurs numériques doivent sommer à une valeur donnée TOCHK
-            if "sum" in rules and isinstance(raw_value, dict):
-                total = sum(int(v) for v in raw_value.values())
-                expected_total = rules["sum"]
-                if total != expected_total:
+                if declaration_parsed is None:
                     self._handle_invalid_meta(
                         meta,
                         key,
-                        f"Le total des valeurs de '{key}' doit faire {expected_total}.",
+                        f"'custom_declaration' invalide pour '{key}' "
+                        "dans pyUPSTIlatex.json.",
                         use_default,
-                        errors,
-                        suffix="validate_rules",
+                        errors_custom,
+                        suffix="bad_custom_declaration_definition",
                     )
 
-            # Règle : valeur_max - valeurs doivent être inférieures à une valeur donnée
-            if "valeur_max" in rules and isinstance(raw_value, int):
-                max_value = rules["valeur_max"]
-                if raw_value > max_value:
+                # a. Vérifier que les clés sont identiques
+                elif raw_value.keys() != expected_keys:
                     self._handle_invalid_meta(
                         meta,
                         key,
-                        f"'{key}' doit être inférieur ou égal à : {max_value}.",
+                        f"Les clés pour '{key}' sont invalides. "
+                        f"(attendu: {list(expected_keys)})",
                         use_default,
-                        errors,
+                        errors_custom,
                         suffix="validate_rules",
                     )
 
-            # Règle : in - les valeurs doivent être dans une liste définie
-            if "in" in rules and isinstance(raw_value, list):
-
-                path = str(rules["in"]).split(".")
-                source = cfg.get(path[0], {})
-
-                if len(path) == 1:
-                    invalid = [v for v in raw_value if v not in source]
-                elif len(path) == 2:
-                    sub_key = path[1]
-                    valid_values = {
-                        item.get(sub_key)
-                        for item in source.values()
-                        if isinstance(item, dict)
-                    }
-                    invalid = [v for v in raw_value if v not in valid_values]
                 else:
-                    invalid = raw_value  # fallback total
-
-                if invalid:
-                    self._handle_invalid_meta(
-                        meta,
-                        key,
-                        f"Valeur(s) non autorisée(s) pour '{key}': {invalid}.",
-                        use_default,
-                        errors,
-                        suffix="validate_rules",
-                    )
-
-            # Règle : custom_rule - règles personnalisées complexes
-            if "custom_rule" in rules and isinstance(raw_value, dict):
-                custom_rule = rules["custom_rule"]
-
-                # Compétences
-                if custom_rule == "competences":
-                    raw_value = meta.get("raw_value", {})
-                    competence_cfg = cfg.get("competence") or {}
-                    competence_errors: List[str] = []
-
-                    for filiere, declaration in raw_value.items():
-                        if not isinstance(declaration, dict):
-                            competence_errors.append(
-                                (
-                                    "La déclaration des compétences pour "
-                                    f"'{filiere}' est invalide."
-                                )
-                            )
-                            continue
-
-                        # declaration est maintenant {annee: [codes]}
-                        filiere_cfg = competence_cfg.get(filiere)
-                        if not isinstance(filiere_cfg, dict):
-                            competence_errors.append(
-                                (
-                                    "La filière '"
-                                    f"{filiere}"
-                                    "' n'existe pas dans la configuration."
-                                )
+                    # b. Vérifier le type de chaque valeur
+                    type_errors = []
+                    for k, expected_type in declaration_parsed.items():
+                        actual_value = raw_value[k]
+                        if not isinstance(actual_value, expected_classes[k]):
+                            type_errors.append(
+                                f"'{k}' (attendu: {expected_type}, "
+                                f"obtenu: {type(actual_value).__name__})"
                             )
-                            continue
-
-                        # Parcourir chaque programme (année) et ses compétences
-                        for programme_key, competences_codes in declaration.items():
-                            programme_cfg = filiere_cfg.get(programme_key)
-                            if not isinstance(programme_cfg, dict):
-                                competence_errors.append(
-                                    (
-                                        "Le programme "
-                                        f"{programme_key}"
-                                        " pour la filière "
-                                        f"{filiere}"
-                                        " n'existe pas."
-                                    )
-                                )
-                                continue
-
-                            if not isinstance(competences_codes, list):
-                                competence_errors.append(
-                                    (
-                                        "Les compétences sélectionnées pour "
-                                        f"'{filiere}' (programme {programme_key})"
-                                        " doivent être une liste."
-                                    )
-                                )
-                                continue
-
-                            missing_codes = [
-                                code
-                                for code in competences_codes
-                                if code not in programme_cfg
-                            ]
-                            if missing_codes:
-                                competence_errors.append(
-                                    (
-                                        "Compétence(s) inconnue(s) pour "
-                                        f"{filiere}"
-                                        " (programme "
-                                        f"{programme_key}"
-                                        f"): {missing_codes}."
-                                    )
-                                )
-
-                    if competence_errors:
-                        self._handle_invalid_meta(
-                            meta,
-                            key,
-                            " ".join(competence_errors),
-                            use_default,
-                            errors,
-                            suffix="validate_rules",
-                        )
-
-        # 4. Gestion des valeurs custom sous forme de dict.
-        for key, meta in meta_ok.items():
-            params = meta.get("parametres", {})
-            custom_declaration = params.get("custom_declaration", {})
-
-            if custom_declaration:
-                raw_value = meta.get("raw_value", {})
 
-                if isinstance(raw_value, dict):
-                    use_default = bool(params.get("default"))
-
-                    try:
-                        custom_declaration_parsed = yaml.safe_load(custom_declaration)
-
-                        # a. Vérifier que les clés sont identiques
-                        expected_keys = set(custom_declaration_parsed.keys())
-                        actual_keys = set(raw_value.keys())
-
-                        if actual_keys != expected_keys:
-                            self._handle_invalid_meta(
-                                meta,
-                                key,
-                                f"Les clés pour '{key}' sont invalides. "
-                                f"(attendu: {list(expected_keys)})",
-                                use_default,
-                                errors,
-                                suffix="validate_rules",
-                            )
-                        else:
-                            # b. Vérifier le type de chaque valeur
-                            type_errors = []
-                            for k, expected_type in custom_declaration_parsed.items():
-                                actual_value = raw_value.get(k)
-                                if not check_types(actual_value, [expected_type]):
-                                    type_errors.append(
-                                        f"'{k}' (attendu: {expected_type}, "
-                                        f"obtenu: {type(actual_value).__name__})"
-                                    )
-
-                            if type_errors:
-                                self._handle_invalid_meta(
-                                    meta,
-                                    key,
-                                    f"Type(s) invalide(s) pour '{key}': "
-                                    f"{', '.join(type_errors)}.",
-                                    use_default,
-                                    errors,
-                                    suffix="validate_rules",
-                                )
-
-                    except yaml.YAMLError:
+                    if type_errors:
                         self._handle_invalid_meta(
                             meta,
                             key,
-                            f"'custom_declaration' invalide pour '{key}' "
-                            "dans pyUPSTIlatex.json.",
+                            f"Type(s) invalide(s) pour '{key}': "
+                            f"{', '.join(type_errors)}.",
                             use_default,
-                            errors,
-                            suffix="bad_custom_declaration_definition",
+                            errors_custom,
+                            suffix="validate_rules",
                         )
 
-        # 5. Gestion des valeurs avec des relations de clé
-        for key, meta in meta_ok.items():
-            params = meta.get("parametres", {})
-            join_key = params.get("join_key", "")
-            raw_value = meta.get("raw_value", "")
+            # 5. Gestion des valeurs avec des relations de clé
+            lookup_table = jointures.get(key)
+            if lookup_table is None:
+                continue
 
-            if join_key:
-                # Déterminer la table de correspondance
-                # (join_source si défini, sinon key)
-                lookup_key = params.get("join_source", key)
-                lookup_table = cfg.get(lookup_key) or {}
+            raw_value = meta["raw_value"]
 
-                # Cas liste : valider chaque élément individuellement
-                if isinstance(raw_value, list):
-                    invalid_items = [
-                        item
-                        for item in raw_value
-                        if isinstance(item, str) and item not in lookup_table
-                    ]
-                    if invalid_items:
-                        use_default = bool(params.get("default"))
-                        self._handle_invalid_meta(
-                            meta,
-                            key,
-                            f"Valeur(s) inconnue(s) pour '{key}': {invalid_items}.",
-                            use_default,
-                            errors,
-                            suffix="bad_key",
-                        )
+            # Cas liste : valider chaque élément individuellement
+            if isinstance(raw_value, list):
+                invalid_items = [
+                    item
+                    for item in raw_value
+                    if isinstance(item, str) and item not in lookup_table
+                ]
+                if invalid_items:
+                    self._handle_invalid_meta(
+                        meta,
+                        key,
+                        f"Valeur(s) inconnue(s) pour '{key}': {invalid_items}.",
+                        use_default,
+                        errors_relations,
+                        suffix="bad_key",
+                    )
+            elif (
+                not isinstance(raw_value, dict)
+                and raw_value != ""
+                and str(raw_value) not in lookup_table
+            ):
                 # Cas 1 : valeur inconnue et pas autorisée comme custom
-                elif (
-                    not isinstance(raw_value, dict)
-                    and raw_value != ""
-                    and str(raw_value) not in lookup_table
-                    and not params.get("custom_can_be_not_related", "")
-                ):
-                    use_default = bool(params.get("default"))
+                if not meta_params.custom_can_be_not_related:
                     self._handle_invalid_meta(
                         meta,
                         key,
                         f"Valeur inconnue pour '{key}': '{raw_value}'.",
                         use_default,
-                        errors,
+                        errors_relations,
                         suffix="bad_key",
                     )
                 # Cas 2 : valeur custom autorisée (custom_can_be_not_related = True)
-                elif (
-                    not isinstance(raw_value, dict)
-                    and raw_value != ""
-                    and str(raw_value) not in lookup_table
-                    and params.get("custom_can_be_not_related", "")
-                ):
+                else:
                     meta["display_flag"] = "info"
-                    errors.append(
-                        [
+                    errors_relations.append(
+                        (
                             f"Valeur custom autorisée pour '{key}': '{raw_value}' "
                             "n'existe pas dans la configuration.",
                             "info",
-                        ]
-                    )
-
-        # 6. Application des valeurs par défaut (pour les champs required mais vides)
-        for key, meta in meta_ok.items():
-            if "type_meta" not in meta:
-                continue
-
-            default_mode = meta.get("parametres", {}).get("default", "")
-            if default_mode == ".env":
-                meta["raw_value"] = valeurs_par_defaut.get(key, "")
-
-            elif default_mode == "calc":
-                meta["raw_value"] = valeurs_par_defaut.get(key, "")
-
-            elif default_mode == "batch_pedagogie":
-                # Gestion groupée pour classe, filière et programme
-                cfg_classe = cfg.get("classe") or {}
-                cfg_filiere = cfg.get("filiere") or {}
-
-                # 1. Gestion de la classe
-                if not meta_ok["classe"].get("raw_value"):
-                    meta_ok["classe"]["raw_value"] = valeurs_par_defaut["classe"]
-                    meta_ok["classe"]["type_meta"] = "default"
-
-                # 2. Gestion de la filière (dépend de la classe)
-                if not meta_ok["filiere"].get("raw_value"):
-                    classe_value = meta_ok["classe"]["raw_value"]
-
-                    # Essayer de déduire la filière depuis la classe
-                    selected_filiere = cfg_classe.get(classe_value, {}).get("filiere")
-
-                    if selected_filiere:
-                        meta_ok["filiere"]["raw_value"] = selected_filiere
-                        # La filière est déduite seulement si la classe
-                        # n'a pas été définie par défaut
-                        if meta_ok["classe"].get("type_meta") != "default":
-                            meta_ok["filiere"]["type_meta"] = "deducted"
-                        else:
-                            meta_ok["filiere"]["type_meta"] = "default"
-                    else:
-                        # Sinon, utiliser la valeur de filière de la classe par défaut
-                        meta_ok["filiere"]["raw_value"] = cfg_classe.get(
-                            valeurs_par_defaut["classe"], {}
-                        ).get("filiere")
-                        meta_ok["filiere"]["type_meta"] = "default"
-
-                # 3. Gestion du programme (dépend de la filière)
-                if not meta_ok["programme"].get("raw_value"):
-                    filiere_value = meta_ok["filiere"]["raw_value"]
-
-                    # Déduire le programme depuis la filière
-                    dernier_programme = cfg_filiere.get(filiere_value, {}).get(
-                        "dernier_programme"
+                        )
                     )
-                    meta_ok["programme"]["raw_value"] = dernier_programme or ""
 
-                    # Le programme est déduit seulement si la filière
-                    # n'a pas été définie par défaut
-                    if meta_ok["filiere"].get("type_meta") != "default":
-                        meta_ok["programme"]["type_meta"] = "deducted"
-                    else:
-                        meta_ok["programme"]["type_meta"] = "default"
-
-                # 4. Gestion de la matière (indépendant)
-                if not meta_ok["matiere"].get("raw_value", ""):
-                    meta_ok["matiere"]["raw_value"] = valeurs_par_defaut["matiere"]
-                    meta_ok["matiere"]["type_meta"] = "default"
+        errors.extend(errors_types)
+        errors.extend(errors_regles)
+        errors.extend(errors_custom)
+        errors.extend(errors_relations)
 
-        # 7. Finalisation des métadonnées
+        # 6 et 7. Application des valeurs par défaut (pour les champs required
+        # mais vides) et finalisation, en une seule passe. Les métadonnées
+        # pédagogiques dépendent les unes des autres : elles sont complétées
+        # ensemble puis finalisées après la boucle.
+        batch_pedagogie = False
         for key, meta in meta_ok.items():
-            raw_value = meta.get("raw_value")
-
-            if meta.get("parametres", {}).get("join_key", False):
-                params = meta.get("parametres", {})
-                lookup_key = params.get("join_source", key)
-
-                # Si c'est une valeur custom
-                if isinstance(raw_value, dict):
-                    meta["valeur"] = raw_value.get("nom")
-                    meta["affichage"] = raw_value.get("affichage", meta["valeur"])
-                    meta["initiales"] = raw_value.get("initiales", meta["valeur"])
-                    continue
-
-                # Si c'est une liste (ex: thematiques)
-                if isinstance(raw_value, list):
-                    lookup = cfg.get(lookup_key) or {}
-                    resolved_valeurs = []
-                    resolved_affichages = []
-                    resolved_initiales = []
-                    for item in raw_value:
-                        obj = lookup.get(item, {})
-                        resolved_valeurs.append(obj.get("nom", item))
-                        resolved_affichages.append(
-                            obj.get("affichage", obj.get("nom", item))
-                        )
-                        resolved_initiales.append(
-                            obj.get("initiales", obj.get("nom", item))
-                        )
-                    meta["valeur"] = resolved_valeurs
-                    meta["affichage"] = resolved_affichages
-                    meta["initiales"] = resolved_initiales
-                    continue
-
-                obj = (cfg.get(lookup_key) or {}).get(raw_value, {})
-                meta["valeur"] = obj.get("nom", "")
-                meta["affichage"] = obj.get("affichage", "")
-                meta["initiales"] = obj.get("initiales", "")
-
-            # Valeurs de repli
-            meta["valeur"] = meta.get("valeur") or raw_value
-            meta["affichage"] = meta.get("affichage") or meta["valeur"]
-            meta["initiales"] = meta.get("initiales") or meta["affichage"]
+            if "type_meta" in meta:
+                default_mode = parametres[key].default
+                if default_mode == ".env" or default_mode == "calc":
+                    meta["raw_value"] = _get_default_metadata_value(key)
+                elif default_mode == "batch_pedagogie":
+                    batch_pedagogie = True
+
+            if key not in _BATCH_PEDAGOGIE_KEYS:
+                _finalize_meta(meta, parametres[key], cfg)
+
+        if batch_pedagogie:
+            _apply_batch_pedagogie(meta_ok, cfg, valeurs_par_defaut)
+        for key in _BATCH_PEDAGOGIE_KEYS:
+            meta = meta_ok.get(key)
+            if meta is not None:
+                _finalize_meta(meta, parametres[key], cfg)
 
         return meta_ok, errors
 
@@ -3394,7 +3533,7 @@ class UPSTILatexDocument:
         key: str,
         reason: str,
         use_default: bool,
-        errors: list,
+        errors: List[Tuple[str, str]],
         suffix: str = "wrong_type",
         flag: str = "",
     ):
@@ -3412,17 +3551,664 @@ class UPSTILatexDocument:
             if use_default
             else "Métadonnée ignorée."
         )
-        errors.append(
-            [
-                f"{reason} {msg}",
-                flag,
-            ]
-        )
+        errors.append((f"{reason} {msg}", flag))
 
 
 # ======================================================================================
 # FONCTIONS UTILITAIRES
 # ======================================================================================
+def _compile_group(
+    document_class: Optional[Type["UPSTILatexDocument"]],
+    paths: List[str],
+    mode: str,
+    dry_run: bool,
+) -> List[tuple[Optional[str], List[List[str]]]]:
+    """Compile à la suite des documents d'un même dossier (compile_batch).
+
+    Fonction de module pour pouvoir être exécutée dans un autre processus.
+    document_class est la classe des documents, ou None pour celle donnée par
+    document_registry.get_document_class().
+    """
+    if document_class is None:
+        from .document_registry import get_document_class
+
+        document_class = get_document_class()
+
+    resultats: List[tuple[Optional[str], List[List[str]]]] = []
+    for path in paths:
+        doc, errors = document_class.from_path(path)
+        if doc is None:
+            resultats.append(("error", errors))
+            continue
+        try:
+            result, messages = doc.compile(mode=mode, verbose="silent", dry_run=dry_run)
+        except Exception as e:
+            result, messages = "error", [
+                [f"Erreur lors de la compilation : {e}", "error"]
+            ]
+        resultats.append((result, errors + messages))
+    return resultats
+
+
+def _apply_batch_pedagogie(
+    meta_ok: Dict[str, Dict], cfg: Dict, valeurs_par_defaut: Dict[str, str]
+) -> None:
+    """Complète classe, filière, programme et matière (défaut batch_pedagogie).
+
+    La filière est déduite de la classe et le programme de la filière.
+    """
+    cfg_classe = cfg.get("classe") or {}
+    cfg_filiere = cfg.get("filiere") or {}
+    classe_md = meta_ok["classe"]
+    filiere_md = meta_ok["filiere"]
+    classe_defaut = valeurs_par_defaut["classe"]
+
+    # 1. Gestion de la classe
+    if not classe_md.get("raw_value"):
+        classe_md["raw_value"] = classe_defaut
+        classe_md["type_meta"] = "default"
+
+    # 2. Gestion de la filière (dépend de la classe)
+    if not filiere_md.get("raw_value"):
+        classe_value = classe_md["raw_value"]
+
+        # Essayer de déduire la filière depuis la classe
+        selected_filiere = (cfg_classe.get(classe_value) or {}).get("filiere")
+
+        if selected_filiere:
+            filiere_md["raw_value"] = selected_filiere
+            # La filière est déduite seulement si la classe
+            # n'a pas été définie par défaut
+            if classe_md.get("type_meta") != "default":
+                filiere_md["type_meta"] = "deducted"
+            else:
+                filiere_md["type_meta"] = "default"
+        else:
+            # Sinon, utiliser la valeur de filière de la classe par défaut
+            filiere_md["raw_value"] = (cfg_classe.get(classe_defaut) or {}).get(
+                "filiere"
+            )
+            filiere_md["type_meta"] = "default"
+
+    # 3. Gestion du programme (dépend de la filière)
+    programme_md = meta_ok["programme"]
+    if not programme_md.get("raw_value"):
+        filiere_value = filiere_md["raw_value"]
+
+        # Déduire le programme depuis la filière
+        dernier_programme = (cfg_filiere.get(filiere_value) or {}).get(
+            "dernier_programme"
+        )
+        programme_md["raw_value"] = dernier_programme or ""
+
+        # Le programme est déduit seulement si la filière
+        # n'a pas été définie par défaut
+        if filiere_md.get("type_meta") != "default":
+            programme_md["type_meta"] = "deducted"
+        else:
+            programme_md["type_meta"] = "default"
+
+    # 4. Gestion de la matière (indépendant)
+    matiere_md = meta_ok["matiere"]
+    if not matiere_md.get("raw_value", ""):
+        matiere_md["raw_value"] = valeurs_par_defaut["matiere"]
+        matiere_md["type_meta"] = "default"
+
+
+def _finalize_meta(meta: Dict, meta_params: "_MetaParams", cfg: Dict) -> None:
+    """Renseigne valeur, affichage et initiales d'une métadonnée formatée."""
+    raw_value = meta["raw_value"]
+
+    if meta_params.join_key:
+        # Table de correspondance (join_source si défini, sinon key)
+        lookup = cfg.get(meta_params.join_source) or {}
+
+        # Si c'est une valeur custom
+        if isinstance(raw_value, dict):
+            valeur = raw_value.get("nom")
+            meta["valeur"] = valeur
+            meta["affichage"] = raw_value.get("affichage", valeur)
+            meta["initiales"] = raw_value.get("initiales", valeur)
+            return
+
+        # Si c'est une liste (ex: thematiques)
+        if isinstance(raw_value, list):
+            resolved_valeurs = []
+            resolved_affichages = []
+            resolved_initiales = []
+            for item in raw_value:
+                obj = lookup.get(item, {})
+                nom = obj.get("nom", item)
+                resolved_valeurs.append(nom)
+                resolved_affichages.append(obj.get("affichage", nom))
+                resolved_initiales.append(obj.get("initiales", nom))
+            meta["valeur"] = resolved_valeurs
+            meta["affichage"] = resolved_affichages
+            meta["initiales"] = resolved_initiales
+            return
+
+        obj = lookup.get(raw_value) or {}
+        meta["valeur"] = obj.get("nom", "")
+        meta["affichage"] = obj.get("affichage", "")
+        meta["initiales"] = obj.get("initiales", "")
+
+    # Valeurs de repli
+    valeur = meta["valeur"] or raw_value
+    affichage = meta["affichage"] or valeur
+    meta["valeur"] = valeur
+    meta["affichage"] = affichage
+    meta["initiales"] = meta["initiales"] or affichage
+
+
+def _has_yaml_marker(content: str) -> bool:
+    """Indique si le marqueur YAML de pyUPSTIlatex v2 est présent.
+
+    Le marqueur doit figurer sur une ligne de commentaire simple (commençant
+    par « % » mais pas par « %% »).
+    """
+    i = content.find(_YAML_MARKER)
+    while i != -1:
+        # Début de la ligne (sans les blancs) jusqu'au marqueur, suivi des
+        # deux premiers caractères du marqueur : le début de la ligne
+        debut_ligne = content.rfind("\n", 0, i) + 1
+        debut = (content[debut_ligne:i].lstrip() + "%#")[:2]
+        if debut[0] == "%" and debut != "%%":
+            return True
+        i = content.find(_YAML_MARKER, i + 1)
+    return False
+
+
+def _competences_index(competence_cfg: Dict) -> FrozenSet[tuple]:
+    """Ensemble des (filière, programme, code) déclarés dans la configuration."""
+    return frozenset(
+        (filiere, programme_key, code)
+        for filiere, filiere_cfg in competence_cfg.items()
+        if isinstance(filiere_cfg, dict)
+        for programme_key, programme_cfg in filiere_cfg.items()
+        if isinstance(programme_cfg, dict)
+        for code in programme_cfg
+    )
+
+
+def _check_competences(
+    raw_value: Any, competence_cfg: Dict, index: FrozenSet[tuple]
+) -> List[str]:
+    """Vérifie une déclaration de compétences {filiere: {programme: [codes]}}.
+
+    index est le résultat de _competences_index(competence_cfg), calculé une
+    fois par configuration.
+
+    Retourne la liste des erreurs rencontrées (vide si tout est valide).
+    """
+    competence_errors: List[str] = []
+
+    for filiere, declaration in raw_value.items():
+        if not isinstance(declaration, dict):
+            competence_errors.append(
+                f"La déclaration des compétences pour '{filiere}' est invalide."
+            )
+            continue
+
+        # declaration est maintenant {annee: [codes]}
+        filiere_cfg = competence_cfg.get(filiere)
+        if not isinstance(filiere_cfg, dict):
+            competence_errors.append(
+                f"La filière '{filiere}' n'existe pas dans la configuration."
+            )
+            continue
+
+        # Parcourir chaque programme (année) et ses compétences
+        for programme_key, competences_codes in declaration.items():
+            programme_cfg = filiere_cfg.get(programme_key)
+            if not isinstance(programme_cfg, dict):
+                competence_errors.append(
+                    (
+                        f"Le programme {programme_key} pour la filière "
+                        f"{filiere} n'existe pas."
+                    )
+                )
+                continue
+
+            if not isinstance(competences_codes, list):
+                competence_errors.append(
+                    (
+                        "Les compétences sélectionnées pour "
+                        f"'{filiere}' (programme {programme_key})"
+                        " doivent être une liste."
+                    )
+                )
+                continue
+
+            missing_codes = [
+                code
+                for code in competences_codes
+                if (filiere, programme_key, code) not in index
+            ]
+            if missing_codes:
+                competence_errors.append(
+                    (
+                        f"Compétence(s) inconnue(s) pour {filiere} "
+                        f"(programme {programme_key}): {missing_codes}."
+                    )
+                )
+
+    return competence_errors
+
+
+# Les « validate_rules » : chaque règle a un constructeur
+# (key, valeur de la règle, cfg) -> vérification(raw_value, meta), qui calcule
+# une seule fois ce qui ne dépend que de la configuration. La vérification
+# produit la raison de chaque non-conformité (None : règle sans effet).
+_RuleCheck = Callable[[Any, Dict], Iterator[str]]
+
+
+def _rule_dict_keys(key: str, rule_value: Any, cfg: Dict) -> Optional[_RuleCheck]:
+    """dict_keys : les clés doivent être dans une liste définie TOCHK."""
+    dict_keys = frozenset(rule_value)
+
+    def check_dict_keys(raw_value, meta):
+        # Test d'inclusion direct sur la vue des clés (sans ensemble
+        # temporaire) ; les clés en trop ne sont calculées qu'en cas d'erreur
+        if isinstance(raw_value, dict) and not raw_value.keys() <= dict_keys:
+            invalid_keys = raw_value.keys() - dict_keys
+            yield f"Clé(s) non autorisée(s) pour '{key}': {list(invalid_keys)}."
+
+    return check_dict_keys
+
+
+# Ensembles résolus dans la configuration pour les règles keys_in et in,
+# indexés par (règle, chemin) : plusieurs métadonnées partagent souvent le même
+# chemin. Vidé par _compile_meta_cfg à chaque nouvelle configuration.
+_CFG_PATHS: Dict[Tuple[str, str], Any] = {}
+
+
+def _resolve_keys_in(cfg: Dict, path_str: str) -> FrozenSet:
+    """Clés du nœud de cfg désigné par path_str (« a.b.c »), mémorisées."""
+    cle = ("keys_in", path_str)
+    if cle not in _CFG_PATHS:
+        source = cfg
+        for p in path_str.split("."):
+            source = source.get(p, {})
+        _CFG_PATHS[cle] = frozenset(source)
+    return _CFG_PATHS[cle]
+
+
+def _resolve_in(cfg: Dict, path_str: str) -> Any:
+    """Valeurs valides pour la règle in (« section » ou « section.champ »).
+
+    Retourne la section elle-même, l'ensemble des valeurs du champ dans les
+    entrées de la section, ou None si le chemin est trop profond.
+    """
+    cle = ("in", path_str)
+    if cle not in _CFG_PATHS:
+        path = path_str.split(".")
+        source = cfg.get(path[0], {})
+        if len(path) == 1:
+            # Clés de la section (même test d'appartenance que sur le dict)
+            valid_values = frozenset(source) if isinstance(source, dict) else source
+        elif len(path) == 2:
+            sub_key = path[1]
+            valid_values = frozenset(
+                item.get(sub_key) for item in source.values() if isinstance(item, dict)
+            )
+        else:
+            valid_values = None  # fallback total
+        _CFG_PATHS[cle] = valid_values
+    return _CFG_PATHS[cle]
+
+
+def _rule_keys_in(key: str, rule_value: Any, cfg: Dict) -> Optional[_RuleCheck]:
+    """keys_in : les clés doivent appartenir aux clés d'un modèle TOCHK."""
+    keys_in = _resolve_keys_in(cfg, str(rule_value))
+
+    def check_keys_in(raw_value, meta):
+        if isinstance(raw_value, dict) and not raw_value.keys() <= keys_in:
+            invalid_keys = raw_value.keys() - keys_in
+            yield f"Clé(s) non autorisée(s) pour '{key}': {list(invalid_keys)}."
+
+    return check_keys_in
+
+
+def _rule_value_type(key: str, rule_value: Any, cfg: Dict) -> Optional[_RuleCheck]:
+    """value_type : les valeurs des différentes clés doivent être typées."""
+    value_types = rule_value if isinstance(rule_value, list) else [rule_value]
+    classes = _resolve_types(value_types)
+
+    def check_value_type(raw_value, meta):
+        if isinstance(raw_value, dict) and any(
+            not isinstance(v, classes) for v in raw_value.values()
+        ):
+            yield f"Les valeurs de '{key}' doivent être de type {value_types}."
+
+    return check_value_type
+
+
+def _rule_extended_types(
+    key: str, rule_value: Any, cfg: Dict
+) -> Optional[_RuleCheck]:
+    """extended_types : vérifie les types d'un dictionnaire hétérogène."""
+    type_schema = [
+        (sub_key, expected_type, _resolve_types([expected_type]))
+        for sub_key, expected_type in rule_value.items()
+    ]
+
+    def check_extended_types(raw_value, meta):
+        if isinstance(raw_value, dict):
+            for sub_key, expected_type, classes in type_schema:
+                if sub_key in raw_value:
+                    sub_value = raw_value[sub_key]
+                    if not isinstance(sub_value, classes):
+                        yield (
+                            f"La clé '{sub_key}' dans '{key}' a un type "
+                            f"invalide. Attendu: {expected_type}, "
+                            f"Reçu: {type(sub_value).__name__}."
+                        )
+
+    return check_extended_types
+
+
+def _rule_sum(key: str, rule_value: Any, cfg: Dict) -> Optional[_RuleCheck]:
+    """sum : les valeurs numériques doivent sommer à une valeur donnée TOCHK."""
+    expected_total = rule_value
+
+    def check_sum(raw_value, meta):
+        if isinstance(raw_value, dict):
+            total = sum(map(int, raw_value.values()))
+            if total != expected_total:
+                yield (
+                    f"Le total des valeurs de '{key}' doit faire {expected_total}."
+                )
+
+    return check_sum
+
+
+def _rule_valeur_max(key: str, rule_value: Any, cfg: Dict) -> Optional[_RuleCheck]:
+    """valeur_max : la valeur doit être inférieure à une valeur donnée."""
+    max_value = rule_value
+
+    def check_valeur_max(raw_value, meta):
+        if isinstance(raw_value, int) and raw_value > max_value:
+            yield f"'{key}' doit être inférieur ou égal à : {max_value}."
+
+    return check_valeur_max
+
+
+def _rule_in(key: str, rule_value: Any, cfg: Dict) -> Optional[_RuleCheck]:
+    """in : les valeurs doivent être dans une liste définie."""
+    valid_values = _resolve_in(cfg, str(rule_value))
+
+    def check_in(raw_value, meta):
+        if isinstance(raw_value, list):
+            if valid_values is None:
+                invalid = raw_value
+            elif isinstance(valid_values, frozenset) and valid_values.issuperset(
+                raw_value
+            ):
+                # Cas courant : tout est valide, sans construire de liste
+                return
+            else:
+                invalid = [v for v in raw_value if v not in valid_values]
+            if invalid:
+                yield f"Valeur(s) non autorisée(s) pour '{key}': {invalid}."
+
+    return check_in
+
+
+def _rule_custom_rule(key: str, rule_value: Any, cfg: Dict) -> Optional[_RuleCheck]:
+    """custom_rule : règles personnalisées complexes (seule « competences »)."""
+    if rule_value != "competences":
+        return None
+    competence_cfg = cfg.get("competence") or {}
+    index = _competences_index(competence_cfg)
+
+    def check_competences(raw_value, meta):
+        if isinstance(raw_value, dict):
+            competence_errors = _check_competences(
+                meta.get("raw_value", {}), competence_cfg, index
+            )
+            if competence_errors:
+                yield " ".join(competence_errors)
+
+    return check_competences
+
+
+# Constructeurs des règles, dans l'ordre où elles sont vérifiées (et donc
+# dans l'ordre des messages), quel que soit l'ordre de déclaration
+_RULE_BUILDERS: Dict[str, Callable[[str, Any, Dict], Optional[_RuleCheck]]] = {
+    "dict_keys": _rule_dict_keys,
+    "keys_in": _rule_keys_in,
+    "value_type": _rule_value_type,
+    "extended_types": _rule_extended_types,
+    "sum": _rule_sum,
+    "valeur_max": _rule_valeur_max,
+    "in": _rule_in,
+    "custom_rule": _rule_custom_rule,
+}
+
+
+def _compile_validate_rules(
+    key: str, rules: Dict, cfg: Dict
+) -> Optional[Callable[[Dict], Iterator[str]]]:
+    """Construit le validateur des « validate_rules » d'une métadonnée.
+
+    Les données dépendant uniquement de la configuration (clés autorisées,
+    valeurs valides, types attendus...) sont calculées une seule fois ici, par
+    les constructeurs de _RULE_BUILDERS. Les règles inconnues sont ignorées.
+
+    Paramètres
+    ----------
+    key : str
+        Nom de la métadonnée (utilisé dans les messages).
+    rules : Dict
+        Règles de validation déclarées dans pyUPSTIlatex.json.
+    cfg : Dict
+        Configuration JSON complète.
+
+    Retourne
+    --------
+    Optional[Callable[[Dict], Iterator[str]]]
+        Générateur qui, pour une métadonnée en cours de formatage, produit la
+        raison de chaque règle non respectée, dans l'ordre des règles. None si
+        aucune règle n'a d'effet.
+    """
+    checks: List[_RuleCheck] = []
+    for name, builder in _RULE_BUILDERS.items():
+        if name in rules:
+            check = builder(key, rules[name], cfg)
+            if check is not None:
+                checks.append(check)
+
+    if not checks:
+        return None
+
+    def valider(meta: Dict) -> Iterator[str]:
+        raw_value = meta.get("raw_value", {})
+        for check in checks:
+            yield from check(raw_value, meta)
+
+    return valider
+
+
+# Valeurs par défaut des métadonnées, reconstruites seulement si load_config()
+# renvoie une nouvelle configuration
+_DEFAULT_METADATA: Dict[str, Any] = {"meta_cfg": None, "valeurs": {}}
+
+
+def _metadata_config_context() -> tuple:
+    """Configuration courante dont dépend le formatage des métadonnées.
+
+    (configuration JSON, configuration .env des métadonnées) : objets remplacés
+    à chaque rechargement de la configuration, comparés par identité pour
+    invalider les métadonnées formatées gardées dans _DOC_CACHE.
+    """
+    return read_json_config()[0], load_config().meta
+
+
+def _get_default_metadata() -> Dict[str, str]:
+    """Retourne les métadonnées par défaut définies dans la configuration (.env).
+
+    id_unique n'en fait pas partie : il dépend de l'heure et est calculé à
+    la demande par _get_default_metadata_value.
+    """
+    meta_cfg = load_config().meta
+    if _DEFAULT_METADATA["meta_cfg"] is not meta_cfg:
+        _DEFAULT_METADATA["valeurs"] = {
+            "variante": meta_cfg.variante,
+            "matiere": meta_cfg.matiere,
+            "classe": meta_cfg.classe,
+            "type_document": meta_cfg.type_document,
+            "titre": meta_cfg.titre,
+            "version": meta_cfg.version,
+            "auteur": meta_cfg.auteur,
+        }
+        _DEFAULT_METADATA["meta_cfg"] = meta_cfg
+    return _DEFAULT_METADATA["valeurs"]
+
+
+def _get_default_metadata_value(key: str) -> str:
+    """Retourne la valeur par défaut d'une métadonnée ("" si aucune)."""
+    if key == "id_unique":
+        epoch = int(time.time())
+        return f"{load_config().meta.id_document_prefixe}{epoch}"
+    return _get_default_metadata().get(key, "")
+
+
+@lru_cache(maxsize=256)
+def _parse_custom_declaration(
+    declaration: str,
+) -> Tuple[Optional[Dict], Optional[FrozenSet[str]], Dict[str, Tuple[type, ...]]]:
+    """Parse la « custom_declaration » YAML d'une métadonnée.
+
+    Retourne (déclaration, clés attendues, {clé: tuple des classes du type
+    attendu}), ou (None, None, {}) si la déclaration n'est pas un dictionnaire
+    YAML valide. Mémoïsé par chaîne :
+    une même déclaration n'est parsée qu'une fois, y compris après un
+    rechargement de la configuration (le résultat, y compris un échec, est
+    partagé et ne doit pas être modifié).
+    """
+    try:
+        parsed = yaml.load(declaration, Loader=_SafeLoader)
+    except yaml.YAMLError:
+        return None, None, {}
+    if not isinstance(parsed, dict):
+        return None, None, {}
+    types = {k: _resolve_types([expected]) for k, expected in parsed.items()}
+    return parsed, frozenset(parsed), types
+
+
+@dataclass(frozen=True, **_SLOTS)
+class _MetaParams:
+    """Paramètres d'une métadonnée (« parametres » de pyUPSTIlatex.json) lus
+    une fois par configuration, pour éviter les dict.get dans _format_metadata.
+    """
+
+    default: Any
+    use_default: bool
+    accepted_types: Any
+    join_key: bool
+    join_source: Any
+    custom_can_be_not_related: bool
+
+    @classmethod
+    def from_dict(cls, key: str, params: Dict) -> "_MetaParams":
+        default = params.get("default", "")
+        return cls(
+            default=default,
+            use_default=bool(default),
+            accepted_types=params.get("accepted_types", []),
+            join_key=bool(params.get("join_key", "")),
+            join_source=params.get("join_source", key),
+            custom_can_be_not_related=bool(params.get("custom_can_be_not_related", "")),
+        )
+
+
+# Données dérivées de la configuration des métadonnées (validateurs de règles,
+# déclarations custom parsées), reconstruites seulement si la configuration
+# change : read_json_config renvoie le même objet tant que les fichiers sont
+# inchangés.
+_META_CFG_COMPILE: Dict[str, Any] = {"cfg": None}
+
+
+def _compile_meta_cfg(cfg: Dict) -> Dict[str, Any]:
+    """Retourne les validateurs et déclarations custom précompilés de cfg.
+
+    Retourne
+    --------
+    Dict[str, Any]
+        - "cles" : frozenset des clés de métadonnées déclarées
+        - "schema" : [(clé, modèle de l'entrée de meta_ok, a une valeur par
+          défaut)], dans l'ordre de la configuration
+        - "parametres" : {clé: _MetaParams}
+        - "types" : {clé: tuple des classes de accepted_types}
+        - "validateurs" : {clé: validateur des validate_rules}
+        - "declarations" : {clé: (déclaration, clés attendues, classes des
+          types attendus)}
+        - "jointures" : {clé: frozenset des clés de la table de correspondance
+          (join_source si défini, sinon clé)}, pour les métadonnées à join_key
+    """
+    if _META_CFG_COMPILE["cfg"] is not cfg:
+        _CFG_PATHS.clear()
+        cfg_meta = cfg.get("metadonnee") or {}
+        schema = []
+        parametres = {}
+        types = {}
+        validateurs = {}
+        declarations = {}
+        jointures = {}
+        for key, meta in cfg_meta.items():
+            params = meta.get("parametres", {})
+            modele = {
+                "label": meta.get("label", "Erreur"),
+                "description": meta.get("description", "Erreur"),
+                "valeur": "",
+                "affichage": "",
+                "initiales": "",
+                "raw_value": "",
+                "initial_value": "",
+                "parametres": params,
+            }
+            meta_params = parametres[key] = _MetaParams.from_dict(key, params)
+            schema.append((key, modele, meta_params.use_default))
+            types[key] = _resolve_types(params.get("accepted_types", []))
+            rules = params.get("validate_rules", {})
+            valider = _compile_validate_rules(key, rules, cfg) if rules else None
+            if valider is not None:
+                validateurs[key] = valider
+            custom_declaration = params.get("custom_declaration", {})
+            if custom_declaration:
+                if not isinstance(custom_declaration, str):
+                    custom_declaration = str(custom_declaration)
+                declarations[key] = _parse_custom_declaration(custom_declaration)
+            if meta_params.join_key:
+                table = cfg.get(meta_params.join_source) or {}
+                jointures[key] = frozenset(table)
+        _META_CFG_COMPILE.update(
+            cfg=cfg,
+            cles=frozenset(cfg_meta),
+            schema=schema,
+            parametres=parametres,
+            types=types,
+            validateurs=validateurs,
+            declarations=declarations,
+            jointures=jointures,
+        )
+    return _META_CFG_COMPILE
+
+
+# Noms de types acceptés dans la configuration (accepted_types, value_type...)
+_TYPE_MAP: Dict[str, Union[type, Tuple[type, ...]]] = {
+    "str": str,
+    "int": int,
+    "float": float,
+    "dict": dict,
+    "list": list,
+    "tuple": tuple,
+    "bool": bool,
+    "set": set,
+    "text": (str, int, float),
+}
+
+
 def check_types(obj: Any, expected_types: Union[str, List[str]]) -> bool:
     """Vérifie si un objet correspond à un ou plusieurs types attendus.
 
@@ -3451,24 +4237,32 @@ def check_types(obj: Any, expected_types: Union[str, List[str]]) -> bool:
     >>> check_types(3.14, ["str", "text"])
     True
     """
-    type_map = {
-        "str": str,
-        "int": int,
-        "float": float,
-        "dict": dict,
-        "list": list,
-        "tuple": tuple,
-        "bool": bool,
-        "set": set,
-        "text": (str, int, float),
-    }
-
     if isinstance(expected_types, str):
         expected_types = [expected_types]
 
     for type_name in expected_types:
-        cls = type_map.get(type_name)
+        cls = _TYPE_MAP.get(type_name)
         if cls and isinstance(obj, cls):
             return True
 
     return False
+
+
+def _resolve_types(expected_types: Union[str, List[str]]) -> Tuple[type, ...]:
+    """Convertit des noms de types (voir check_types) en tuple de classes.
+
+    isinstance(obj, _resolve_types(noms)) équivaut à check_types(obj, noms),
+    en un seul appel : à utiliser quand les noms sont connus à l'avance. Les
+    noms inconnus sont ignorés.
+    """
+    if isinstance(expected_types, str):
+        expected_types = [expected_types]
+
+    types: List[type] = []
+    for type_name in expected_types:
+        cls = _TYPE_MAP.get(type_name) if isinstance(type_name, str) else None
+        if isinstance(cls, tuple):
+            types.extend(cls)
+        elif cls is not None:
+            types.append(cls)
+    return tuple(types)
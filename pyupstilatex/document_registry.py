@@ -6,12 +6,18 @@ depuis le dossier custom/ sans modifier le code source du package.
 
 import importlib.util
 import sys
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Type
 
 from .document import UPSTILatexDocument
 
+# Chemin vers custom/document.py, calculé une seule fois à l'import
+# (2 niveaux au-dessus : pyupstilatex/ puis pyUPSTIlatex/)
+_CUSTOM_MODULE_PATH = Path(__file__).resolve().parents[2] / "custom" / "document.py"
 
+
+@lru_cache(maxsize=1)
 def discover_custom_document_class() -> Optional[Type[UPSTILatexDocument]]:
     """Découvre une classe UPSTILatexDocument personnalisée dans custom/document.py.
 
@@ -28,20 +34,16 @@ def discover_custom_document_class() -> Optional[Type[UPSTILatexDocument]]:
     - Le fichier custom/document.py ne doit PAS être un package (pas de __init__.py)
     - La classe CustomUPSTILatexDocument doit hériter de UPSTILatexDocument
     - Les erreurs d'import sont silencieuses (retourne None)
+    - Le résultat (y compris None) est mis en cache pour la durée du processus :
+      voir invalidate_document_class_cache()
     """
     try:
-        # Chemin vers custom/document.py
-        # (2 niveaux au-dessus : pyupstilatex/ puis pyUPSTIlatex/)
-        custom_module_path = (
-            Path(__file__).resolve().parents[2] / "custom" / "document.py"
-        )
-
-        if not custom_module_path.exists():
+        if not _CUSTOM_MODULE_PATH.exists():
             return None
 
         # Chargement dynamique du module
         spec = importlib.util.spec_from_file_location(
-            "custom_document", custom_module_path
+            "custom_document", _CUSTOM_MODULE_PATH
         )
         if spec is None or spec.loader is None:
             return None
@@ -69,6 +71,11 @@ def discover_custom_document_class() -> Optional[Type[UPSTILatexDocument]]:
         return None
 
 
+def invalidate_document_class_cache() -> None:
+    """Force une nouvelle recherche de custom/document.py au prochain appel."""
+    discover_custom_document_class.cache_clear()
+
+
 def get_document_class() -> Type[UPSTILatexDocument]:
     """Retourne la classe de document à utiliser (personnalisée ou par défaut).
 
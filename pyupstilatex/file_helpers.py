@@ -1,7 +1,10 @@
+import codecs
 import fnmatch
 import json
 import os
+import re
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Union
@@ -17,6 +20,18 @@ JSON_CUSTOM_CONFIG_PATH = (
 )
 
 
+# Configurations JSON déjà lues, indexées par (chemin, mtime du fichier
+# principal, mtime du fichier custom)
+_JSON_CONFIG_CACHE: Dict[tuple, tuple[dict, List[List[str]]]] = {}
+
+
+def _mtime_ns(path: Path) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
 def read_json_config(
     path: Optional[Path | str] = None,
 ) -> tuple[Optional[dict], List[List[str]]]:
@@ -24,6 +39,9 @@ def read_json_config(
 
     Charge le fichier JSON principal, puis applique les modifications du
     fichier custom si présent (sections 'remove' et 'create_or_modify').
+    Le résultat est mis en cache tant que les fichiers ne sont pas modifiés
+    (date de modification) : le dictionnaire retourné est partagé entre les
+    appels et ne doit pas être modifié.
 
     Paramètres
     ----------
@@ -38,6 +56,45 @@ def read_json_config(
         - data : dictionnaire de configuration (ou None en cas d'erreur)
         - messages : liste de [message, flag] pour erreurs/avertissements
     """
+    json_path = JSON_CONFIG_PATH if path is None else Path(path)
+    mtime = _mtime_ns(json_path)
+    if mtime is None:
+        # Fichier absent/inaccessible : on laisse la lecture produire l'erreur
+        return _read_json_config(path)
+
+    cle = (
+        str(json_path),
+        mtime,
+        _mtime_ns(JSON_CUSTOM_CONFIG_PATH) if path is None else None,
+    )
+    cached = _JSON_CONFIG_CACHE.get(cle)
+    if cached is None:
+        data, messages = _read_json_config(path)
+        if data is None:
+            return data, messages
+        cached = _JSON_CONFIG_CACHE[cle] = (data, messages)
+    return cached[0], list(cached[1])
+
+
+def invalidate_config_cache() -> None:
+    """Vide les caches de configuration (JSON et TOML/.env).
+
+    Les caches se renouvellent d'eux-mêmes quand un fichier est modifié : cette
+    fonction sert à forcer une relecture (tests, modification de os.environ...).
+    Le cache partagé des documents, dont les métadonnées formatées dépendent de
+    la configuration, est vidé en même temps.
+    """
+    from .document import UPSTILatexDocument
+
+    _JSON_CONFIG_CACHE.clear()
+    load_config.cache_clear()
+    UPSTILatexDocument.clear_cache()
+
+
+def _read_json_config(
+    path: Optional[Path | str] = None,
+) -> tuple[Optional[dict], List[List[str]]]:
+    """Lecture effective (sans cache) de read_json_config."""
     messages: List[List[str]] = []
 
     # Fonction pour supprimer récursivement des clés selon la structure "remove"
@@ -190,151 +247,201 @@ def scan_for_documents(
         exclude_patterns = list(cfg.traitement_par_lot.fichiers_a_exclure)
     exclude_patterns = exclude_patterns or []
 
-    all_documents: List[Dict[str, str]] = []
+    # Compilation des motifs d'exclusion en une seule expression régulière
+    # (même sémantique que fnmatch.fnmatch, testée une fois par fichier)
+    exclude_re = (
+        re.compile(
+            "|".join(
+                fnmatch.translate(os.path.normcase(pat)) for pat in exclude_patterns
+            )
+        )
+        if exclude_patterns
+        else None
+    )
 
-    for root in roots:
-        if not os.path.isdir(root):
-            messages.append([f"Le dossier spécifié n'existe pas : {root}", "warning"])
-            continue
+    # Analyse d'un fichier : lecture, paramètres de compilation et version.
+    # Les messages sont retournés (et non émis) pour pouvoir exécuter cette
+    # fonction dans plusieurs threads.
+    def analyse_fichier(
+        file_path: Path,
+    ) -> Tuple[Optional[Dict[str, str]], List[List[str]]]:
+        file_messages: List[List[str]] = []
 
-        p = Path(root)
-        tex_files = list(p.rglob("*.tex")) + list(p.rglob("*.ltx"))
+        # Initialiser le document
+        doc, doc_errors = UPSTILatexDocument.from_path(str(file_path))
+        if doc_errors:
+            for derr in doc_errors:
+                file_messages.append(
+                    [
+                        f"Erreur lors de la lecture de {file_path}: {derr[0]}",
+                        derr[1],
+                    ]
+                )
+            return None, file_messages
+        if doc is None:
+            file_messages.append(
+                [f"Impossible d'initialiser le document: {file_path}", "error"]
+            )
+            return None, file_messages
 
-        for file_path in tex_files:
-            # Appliquer les motifs d'exclusion
-            rel = None
-            try:
-                rel = file_path.relative_to(p)
-            except Exception:
-                rel = file_path.name
-            rel_str = str(rel)
-            should_exclude = False
-            for pat in exclude_patterns:
-                if fnmatch.fnmatch(file_path.name, pat) or fnmatch.fnmatch(
-                    rel_str, pat
-                ):
-                    should_exclude = True
-                    break
-            if should_exclude:
-                continue
+        # Vérifier la lisibilité
+        if not doc.is_readable:
+            reason = doc.readable_reason or "Raison inconnue"
+            flag = doc.readable_flag or "error"
+            file_messages.append([f"Fichier illisible ({file_path}): {reason}", flag])
+            return None, file_messages
 
-            # Initialiser le document
-            doc, doc_errors = UPSTILatexDocument.from_path(str(file_path))
-            if doc_errors:
-                for derr in doc_errors:
-                    messages.append(
-                        [
-                            f"Erreur lors de la lecture de {file_path}: {derr[0]}",
-                            derr[1],
-                        ]
-                    )
-                continue
-            if doc is None:
+        # Vérifier si le fichier doit être ignoré (paramètre ignore=True)
+        try:
+            params, _ = doc.get_compilation_parameters()
+            if params and params.get("ignore", False):
+                return None, file_messages
+        except Exception:
+            # En cas d'erreur, on ne filtre pas le fichier
+            pass
+
+        # Détection de la version
+        version, version_errors = doc.get_version()
+        if version_errors:
+            for verr in version_errors:
+                file_messages.append([f"{file_path}: {verr[0]}", verr[1]])
+
+        # Déterminer la compatibilité
+        compatible = version.get("pyupstilatex") is not None and version.get(
+            "latex"
+        ) in {
+            "upsti-latex",
+            "UPSTI_Document",
+            "EPB_Cours",
+        }
+
+        # Filtrer selon le mode demandé (compatible/incompatible/all)
+        if (filter_mode == "compatible" and not compatible) or (
+            filter_mode == "incompatible" and compatible
+        ):
+            return None, file_messages
+
+        # Récupérer le paramètre de compilation pour les documents compatibles
+        # (pour les autres, on considère a_compiler = False)
+        a_compiler = False
+        if compatible:
+            # Les documents EPB_Cours ont toujours a_compiler = False
+            if version.get("latex") != "EPB_Cours":
+                try:
+                    params, _ = doc.get_compilation_parameters()
+                    if params:
+                        a_compiler = bool(params.get("compiler", False))
+                except Exception:
+                    pass
+
+        # Filtrer selon compilable_filter (compilable/non-compilable/all)
+        if (compilable_filter == "compilable" and not a_compiler) or (
+            compilable_filter == "non-compilable" and a_compiler
+        ):
+            return None, file_messages
+
+        # Préparer l'entrée du document (uniquement pour ceux conservés)
+        doc_entry = {
+            "name": file_path.stem,
+            "filename": file_path.name,
+            "path": str(file_path.resolve()),
+            "version_pyupstilatex": version.get("pyupstilatex", "inconnue"),
+            "version_latex": version.get("latex", "inconnue"),
+            "compatible": compatible,
+        }
+        if compatible:
+            doc_entry["a_compiler"] = a_compiler
+
+        return doc_entry, file_messages
+
+    # Suffixes des fichiers générés pour les versions accessibles
+    # (pattern : "*{suffixe_accessibilite}.tex"), exclus du scan
+    accessibility_endings = tuple(
+        os.path.normcase(f"{info['suffixe']}.tex")
+        for info in VERSIONS_ACCESSIBLES_DISPONIBLES.values()
+        if info.get("suffixe", "")
+    )
+
+    # Recherche des fichiers candidats, analysés en parallèle (opérations
+    # essentiellement I/O) au fur et à mesure du parcours des dossiers. Les
+    # résultats sont lus dans l'ordre des fichiers, et les messages ajoutés
+    # séquentiellement.
+    all_documents: List[Dict[str, str]] = []
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        analyses = []
+        for root in roots:
+            if not os.path.isdir(root):
                 messages.append(
-                    [f"Impossible d'initialiser le document: {file_path}", "error"]
+                    [f"Le dossier spécifié n'existe pas : {root}", "warning"]
                 )
                 continue
 
-            # Vérifier la lisibilité
-            if not doc.is_readable:
-                reason = doc.readable_reason or "Raison inconnue"
-                flag = doc.readable_flag or "error"
-                messages.append([f"Fichier illisible ({file_path}): {reason}", flag])
-                continue
+            for file_str, name, rel_str in _iter_tex_files(root):
+                # Exclure les fichiers des versions accessibles
+                if accessibility_endings and os.path.normcase(name).endswith(
+                    accessibility_endings
+                ):
+                    continue
 
-            # Vérifier si le fichier doit être ignoré (paramètre ignore=True)
-            try:
-                params, _ = doc.get_compilation_parameters()
-                if params and params.get("ignore", False):
+                # Appliquer les motifs d'exclusion
+                if exclude_re is not None and (
+                    exclude_re.match(os.path.normcase(name))
+                    or exclude_re.match(os.path.normcase(rel_str))
+                ):
                     continue
-            except Exception:
-                # En cas d'erreur, on ne filtre pas le fichier
-                pass
-
-            # Détection de la version
-            version, version_errors = doc.get_version()
-            if version_errors:
-                for verr in version_errors:
-                    messages.append([f"{file_path}: {verr[0]}", verr[1]])
-
-            # Déterminer la compatibilité
-            compatible = version.get("pyupstilatex") is not None and version.get(
-                "latex"
-            ) in {
-                "upsti-latex",
-                "UPSTI_Document",
-                "EPB_Cours",
-            }
 
-            # Préparer l'entrée du document
-            doc_entry = {
-                "name": file_path.stem,
-                "filename": file_path.name,
-                "path": str(file_path.resolve()),
-                "version_pyupstilatex": version.get("pyupstilatex", "inconnue"),
-                "version_latex": version.get("latex", "inconnue"),
-                "compatible": compatible,
-            }
+                analyses.append(executor.submit(analyse_fichier, Path(file_str)))
 
-            # Récupérer le paramètre de compilation pour les documents compatibles
-            if compatible:
-                # Les documents EPB_Cours ont toujours a_compiler = False
-                if version.get("latex") == "EPB_Cours":
-                    a_compiler = False
-                else:
-                    a_compiler = False
-                    try:
-                        params, _ = doc.get_compilation_parameters()
-                        if params:
-                            a_compiler = bool(params.get("compiler", False))
-                    except Exception:
-                        pass
-                doc_entry["a_compiler"] = a_compiler
-
-            all_documents.append(doc_entry)
-
-    # Filtrer selon le mode demandé (compatible/incompatible/all)
-    if filter_mode == "compatible":
-        temp_documents = [d for d in all_documents if d["compatible"]]
-    elif filter_mode == "incompatible":
-        temp_documents = [d for d in all_documents if not d["compatible"]]
-    else:  # "all"
-        temp_documents = all_documents
-
-    # Filtrer selon compilable_filter (compilable/non-compilable/all)
-    # Pour les documents sans clé 'a_compiler', on considère False
-    if compilable_filter == "compilable":
-        filtered_documents = [
-            d for d in temp_documents if bool(d.get("a_compiler", False))
-        ]
+        for analyse in analyses:
+            doc_entry, file_messages = analyse.result()
+            messages.extend(file_messages)
+            if doc_entry is not None:
+                all_documents.append(doc_entry)
 
-    elif compilable_filter == "non-compilable":
-        filtered_documents = [
-            d for d in temp_documents if not bool(d.get("a_compiler", False))
-        ]
-    else:  # "all"
-        filtered_documents = temp_documents
+    return all_documents, messages
 
-    # Exclure les fichiers qui correspondent aux suffixes d'accessibilité
-    # Pattern: "*.{suffixe_accessibilite}.tex"
-    accessibility_suffixes = [
-        info.get("suffixe", "") for info in VERSIONS_ACCESSIBLES_DISPONIBLES.values()
-    ]
-    accessibility_patterns = [
-        f"*{suffix}.tex" for suffix in accessibility_suffixes if suffix
-    ]
 
-    final_documents = []
-    for doc in filtered_documents:
-        filename = doc["filename"]
-        # Vérifier si le nom du fichier correspond à un pattern d'accessibilité
-        is_accessibility_file = any(
-            fnmatch.fnmatch(filename, pattern) for pattern in accessibility_patterns
-        )
-        if not is_accessibility_file:
-            final_documents.append(doc)
+def _iter_tex_files(root: str):
+    """Parcourt récursivement un dossier à la recherche de fichiers .tex/.ltx.
 
-    return final_documents, messages
+    Parcours itératif basé sur os.scandir : le type des entrées est fourni
+    par le système lors de la lecture du dossier, sans appel stat()
+    supplémentaire ni création d'objets Path intermédiaires. Les liens
+    symboliques vers des dossiers ne sont pas suivis. L'extension est comparée
+    après os.path.normcase : insensible à la casse sous Windows (« .TEX »).
+
+    Paramètres
+    ----------
+    root : str
+        Dossier racine du parcours.
+
+    Retourne
+    --------
+    Iterator[Tuple[str, str, str]]
+        Tuples (chemin, nom du fichier, chemin relatif à root).
+    """
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif (
+                            os.path.normcase(entry.name).endswith((".tex", ".ltx"))
+                            and entry.is_file()
+                        ):
+                            yield (
+                                entry.path,
+                                entry.name,
+                                os.path.relpath(entry.path, root),
+                            )
+                    except OSError:
+                        continue
+        except OSError:
+            continue
 
 
 def create_compilation_parameter_file(
@@ -1678,16 +1785,23 @@ def get_template_env(use_latex_delimiters: bool = False) -> Environment:
     return env
 
 
-def check_path_readable(path: str) -> Tuple[bool, Optional[str], Optional[str]]:
+def check_path_readable(
+    path: str, assume_file: bool = False
+) -> Tuple[bool, Optional[str], Optional[str]]:
     """Vérifie l'accessibilité en lecture d'un fichier.
 
     Teste si le chemin existe, est un fichier, et peut être lu en tant que
-    fichier texte. Tente d'abord un décodage UTF-8, puis latin-1 en fallback.
+    fichier texte. Tente d'abord un décodage UTF-8, puis un encodage de repli
+    (voir detect_text_encoding).
 
     Paramètres
     ----------
     path : str
         Chemin du fichier à vérifier.
+    assume_file : bool, optional
+        Si True, le chemin est supposé désigner un fichier existant (déjà
+        vérifié par l'appelant) : les tests d'existence sont omis.
+        Défaut : False.
 
     Retourne
     --------
@@ -1695,7 +1809,7 @@ def check_path_readable(path: str) -> Tuple[bool, Optional[str], Optional[str]]:
         Tuple (accessible, raison, flag) où :
         - accessible : True si le fichier peut être lu, False sinon.
         - raison : None si accessible, sinon message décrivant l'erreur ou
-          avertissement (ex: "Fichier lu en latin-1 (fallback d'encodage)").
+          avertissement (ex: "Fichier lu en cp1252 (fallback d'encodage)").
         - flag : None si OK, 'warning' si fallback d'encodage utilisé,
           'fatal_error' si lecture impossible.
 
@@ -1707,31 +1821,95 @@ def check_path_readable(path: str) -> Tuple[bool, Optional[str], Optional[str]]:
     (False, "Fichier introuvable", "fatal_error")
     """
     p = Path(path)
-    if not p.exists():
-        return False, "Fichier introuvable", "fatal_error"
-    if not p.is_file():
-        return False, "N'est pas un fichier", "fatal_error"
+    if not assume_file:
+        if not p.exists():
+            return False, "Fichier introuvable", "fatal_error"
+        if not p.is_file():
+            return False, "N'est pas un fichier", "fatal_error"
     try:
-        # Lecture d'un octet pour forcer le décodage (et déclencher
-        # UnicodeDecodeError si l'encodage est incorrect).
-        # Lire 0 octet n'effectue pas de décodage.
-        with p.open("r", encoding="utf-8") as f:
-            f.read(1)
-    except UnicodeDecodeError:
-        # Tentative de fallback en latin-1 — ne lèvera pas d'UnicodeDecodeError
-        try:
-            with p.open("r", encoding="latin-1") as f:
-                f.read(1)
-        except Exception as e:
-            return False, f"Impossible de lire: {e}", "fatal_error"
-        else:
-            return True, "Fichier lu en latin-1 (fallback d'encodage)", "warning"
+        with p.open("rb") as f:
+            debut = f.read(ENCODING_PROBE_SIZE)
     except Exception as e:
         return False, f"Impossible de lire: {e}", "fatal_error"
-    return True, None, None
+    return probe_text_encoding(debut)
+
+
+# Taille du début de fichier dont le décodage est vérifié (celle du premier
+# bloc décodé par une lecture en mode texte)
+ENCODING_PROBE_SIZE = 8192
+
+
+# Encodages de repli envisagés quand un fichier n'est pas en UTF-8 (documents
+# en français : Windows et ISO occidentaux)
+FALLBACK_ENCODINGS = ("cp1252", "iso8859_15", "latin_1")
+
+ENCODING_FALLBACK_REASON = "Fichier lu en {} (fallback d'encodage)"
+
 
+def detect_text_encoding(debut: bytes) -> Optional[str]:
+    """Détecte l'encodage du début d'un fichier texte.
 
-def check_path_writable(path: str) -> Tuple[bool, Optional[str], Optional[str]]:
+    Un caractère multi-octets coupé en fin d'échantillon n'est pas une erreur
+    UTF-8. Si le décodage UTF-8 échoue, l'encodage est détecté parmi
+    FALLBACK_ENCODINGS avec charset-normalizer (dépendance optionnelle) ;
+    à défaut, latin-1 est utilisé car il décode tous les octets.
+
+    Paramètres
+    ----------
+    debut : bytes
+        Premiers octets du fichier.
+
+    Retourne
+    --------
+    Optional[str]
+        None si le fichier est en UTF-8, sinon l'encodage de repli.
+    """
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(debut, final=False)
+        return None
+    except UnicodeDecodeError:
+        pass
+
+    try:
+        from charset_normalizer import from_bytes
+    except ImportError:
+        return "latin-1"
+
+    meilleur = from_bytes(debut, cp_isolation=list(FALLBACK_ENCODINGS)).best()
+    if meilleur is None or meilleur.encoding == "latin_1":
+        return "latin-1"
+    return meilleur.encoding
+
+
+def probe_text_encoding(
+    debut: bytes,
+) -> Tuple[bool, Optional[str], Optional[str]]:
+    """Vérifie que le début d'un fichier se décode en UTF-8.
+
+    Même résultat que check_path_readable, à partir des premiers octets du
+    fichier déjà lus par l'appelant (ENCODING_PROBE_SIZE octets) : évite de
+    rouvrir le fichier.
+
+    Paramètres
+    ----------
+    debut : bytes
+        Premiers octets du fichier.
+
+    Retourne
+    --------
+    Tuple[bool, Optional[str], Optional[str]]
+        (True, None, None) si UTF-8, sinon (True, raison, 'warning') : la
+        lecture se fera dans l'encodage de repli détecté.
+    """
+    encodage = detect_text_encoding(debut)
+    if encodage is None:
+        return True, None, None
+    return True, ENCODING_FALLBACK_REASON.format(encodage), "warning"
+
+
+def check_path_writable(
+    path: str, assume_file: bool = False
+) -> Tuple[bool, Optional[str], Optional[str]]:
     """Vérifie l'accessibilité en écriture d'un fichier existant.
 
     Teste si le fichier existe et peut être ouvert en mode écriture.
@@ -1741,6 +1919,10 @@ def check_path_writable(path: str) -> Tuple[bool, Optional[str], Optional[str]]:
     ----------
     path : str
         Chemin du fichier à vérifier.
+    assume_file : bool, optional
+        Si True, le chemin est supposé désigner un fichier existant (déjà
+        vérifié par l'appelant) : les tests d'existence sont omis.
+        Défaut : False.
 
     Retourne
     --------
@@ -1759,10 +1941,11 @@ def check_path_writable(path: str) -> Tuple[bool, Optional[str], Optional[str]]:
     (False, "Permission refusée: ...", "fatal_error")
     """
     p = Path(path)
-    if not p.exists():
-        return False, "Fichier introuvable", "fatal_error"
-    if not p.is_file():
-        return False, "N'est pas un fichier", "fatal_error"
+    if not assume_file:
+        if not p.exists():
+            return False, "Fichier introuvable", "fatal_error"
+        if not p.is_file():
+            return False, "N'est pas un fichier", "fatal_error"
     try:
         # 'r+b' requiert que le fichier existe et autorise l'écriture sans le
         # tronquer
@@ -1,3 +1,4 @@
+import re as _stdlib_re
 from typing import Any, Dict, List, Optional, Tuple
 
 import regex as re
@@ -6,6 +7,12 @@ import yaml
 from .config import load_config
 from .file_helpers import read_json_config
 
+# Chargeur YAML en C (libyaml) si PyYAML a été compilé avec, sinon en Python
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader  # type: ignore
+
 
 def parse_metadata_yaml(text: str) -> Tuple[Dict[str, Any], List[List[str]]]:
     """Extrait et parse le YAML des métadonnées d'un document UPSTI.
@@ -67,7 +74,7 @@ def parse_metadata_yaml(text: str) -> Tuple[Dict[str, Any], List[List[str]]]:
     block_clean = _strip_yaml_inline_comments(block)
 
     try:
-        data = yaml.safe_load(block_clean) or {}
+        data = yaml.load(block_clean, Loader=_SafeLoader) or {}
         if not isinstance(data, dict):
             errors.append(
                 [
@@ -316,6 +323,9 @@ def parse_metadata_tex(
     return result, errors
 
 
+_COMMENT_CHAR_RE = re.compile(r"^% ?", re.MULTILINE)
+
+
 def read_tex_zone(
     text: str, zone_name: str, remove_comment_char: bool = False
 ) -> Optional[str]:
@@ -356,11 +366,10 @@ def read_tex_zone(
     content = match.group(1).rstrip("\n")
 
     if remove_comment_char:
-        cleaned_lines = []
-        for line in content.splitlines():
-            # Supprime un seul '%' en début de ligne, et l'espace qui suit s'il existe
-            cleaned_lines.append(re.sub(r"^% ?", "", line))
-        return "\n".join(cleaned_lines).rstrip("\n")
+        # Supprime un seul '%' en début de ligne, et l'espace qui suit s'il
+        # existe : une seule substitution sur toute la zone, sans découper
+        # puis recoller les lignes
+        return _COMMENT_CHAR_RE.sub("", content).rstrip("\n")
 
     return content
 
@@ -665,6 +674,13 @@ def parse_package_import(line: str) -> Optional[Dict[str, Any]]:
     return {"decl": decl, "name": name, "options": opts}
 
 
+# Compilé une fois avec le module standard : motif sans construction propre à
+# ``regex``, et ``re`` le parcourt nettement plus vite sur un document entier.
+_PACKAGE_IMPORT_RE = _stdlib_re.compile(
+    r"\\(?:usepackage|RequirePackage)\s*(?:\[[^\]]*\])?\s*\{([^}]*)\}"
+)
+
+
 def parse_package_imports(content: str) -> List[str]:
     r"""Retourne la liste des noms de packages importés.
 
@@ -685,9 +701,8 @@ def parse_package_imports(content: str) -> List[str]:
     - Imports multiples : \\usepackage{pkgA,pkgB}
     - Chemins : \\usepackage{Dummy/Path/UPSTI_Document} -> UPSTI_Document
     """
-    pat = re.compile(r"\\(?:usepackage|RequirePackage)\s*(?:\[[^\]]*\])?\s*\{([^}]*)\}")
     packages: List[str] = []
-    for m in pat.findall(content):
+    for m in _PACKAGE_IMPORT_RE.findall(content):
         for raw in m.split(','):
             raw = raw.strip()
             if not raw:
@@ -1,9 +1,36 @@
+import codecs
+import os
+import stat
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import List, Optional
 
 from .exceptions import DocumentParseError
-from .file_helpers import check_path_readable, check_path_writable
+from .file_helpers import (
+    ENCODING_FALLBACK_REASON,
+    ENCODING_PROBE_SIZE,
+    check_path_readable,
+    check_path_writable,
+    detect_text_encoding,
+)
+
+# BOM des encodages UTF-32/UTF-16 : ces fichiers contiennent des octets nuls
+# mais sont du texte (UTF-32 testé en premier, le BOM UTF-16 LE en est un
+# préfixe)
+_WIDE_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+def _wide_bom_encoding(sample: bytes) -> Optional[str]:
+    """Retourne l'encodage UTF-16/32 signalé par le BOM de sample, ou None."""
+    for bom, encodage in _WIDE_BOMS:
+        if sample.startswith(bom):
+            return encodage
+    return None
 
 
 @dataclass
@@ -21,11 +48,17 @@ class DocumentFile:
         Si True, lève des exceptions en cas de problème. Défaut : False.
     require_writable : bool, optional
         Si True (et strict=True), exige que le fichier soit modifiable. Défaut : False.
+    trusted : bool, optional
+        Si True, le chemin provient d'une source déjà validée (ex:
+        scan_for_documents) : fichier existant, extension .tex/.ltx, non
+        binaire. Ces vérifications sont alors omises ; seuls l'encodage et
+        l'écriture sont testés. Défaut : False.
     """
 
     source: str
     strict: bool = False
     require_writable: bool = False
+    trusted: bool = False
 
     # États du fichier
     _file_exists: Optional[bool] = field(default=None, init=False)
@@ -36,13 +69,17 @@ class DocumentFile:
     _file_writable_reason: Optional[str] = field(default=None, init=False)
     _read_encoding: Optional[str] = field(default=None, init=False)
     _raw: Optional[str] = field(default=None, init=False)
+    _path: Optional[Path] = field(default=None, init=False, repr=False)
+    _readable_probed: bool = field(default=False, init=False, repr=False)
+    _writable_probed: bool = field(default=False, init=False, repr=False)
 
     def __post_init__(self):
         """Initialise les états du fichier.
 
-        Vérifie l'existence, la lisibilité et l'écritabilité du fichier.
-        Détecte les fichiers binaires et les problèmes d'encodage.
-        En mode strict, lève des exceptions si les conditions ne sont pas remplies.
+        Les sondes d'existence, de lisibilité et d'écriture sont différées
+        jusqu'au premier accès aux propriétés correspondantes : construire un
+        document non strict ne touche pas au disque. En mode strict, elles
+        sont exécutées immédiatement afin de lever les erreurs au plus tôt.
 
         Raises
         ------
@@ -50,100 +87,152 @@ class DocumentFile:
             Si le fichier est introuvable, illisible ou non ouvrable en écriture
             en mode strict.
         """
+        if not self.strict:
+            return
+
+        # Mode strict : on lève des erreurs précises si accès impossible
+        self._probe_readable()
+        if not self._file_exists:
+            raise DocumentParseError(
+                f"Fichier introuvable ou non fichier: {self.source}"
+            )
+        if not self._file_readable:
+            raise DocumentParseError(
+                f"Fichier illisible: {self.source} — "
+                f"{self._file_readable_reason or 'raison inconnue'}"
+            )
+        if self.require_writable:
+            self._probe_writable()
+            if self._file_writable is True:
+                pass
+            elif self._file_writable is False:
+                raise DocumentParseError(
+                    f"Fichier non ouvrable en écriture: {self.source} "
+                    f"— {self._file_writable_reason or 'raison inconnue'}"
+                )
+            else:
+                raise DocumentParseError(
+                    f"Capacité d'écriture non vérifiable pour ce stockage: "
+                    f"{self.source}"
+                )
+
+    def _probe_readable(self) -> None:
+        """Vérifie l'existence et la lisibilité du fichier (une seule fois).
+
+        Détecte les fichiers binaires et les problèmes d'encodage. Les
+        erreurs inattendues ne sont jamais propagées.
+        """
+        if self._readable_probed:
+            return
+        self._readable_probed = True
         try:
-            p = Path(self.source)
-            self._file_exists = p.is_file()
+            if self.trusted:
+                # Chemin déjà validé en amont : seule la vérification
+                # d'encodage est effectuée
+                self._file_exists = True
+                try:
+                    sample = self._read_sample()
+                except Exception as e:
+                    self._file_readable = False
+                    self._file_readable_reason = f"Impossible de lire: {e}"
+                    self._file_readable_flag = "fatal_error"
+                    return
+                self._set_encoding(sample)
+                return
+
+            # Un seul stat pour l'existence et le type
+            try:
+                self._file_exists = stat.S_ISREG(os.stat(self.source).st_mode)
+            except (OSError, ValueError):
+                self._file_exists = False
 
             # Refuse explicitement tout fichier qui n'est pas un .tex ou un .ltx
-            if p.suffix.lower() not in [".tex", ".ltx"]:
+            if os.path.splitext(self.source)[1].lower() not in (".tex", ".ltx"):
                 self._file_readable = False
                 self._file_readable_reason = "Le fichier n'est pas un fichier tex"
                 self._file_readable_flag = "fatal_error"
-                # Écriture : si le fichier existe on indique l'état,
-                # sinon on signale inexistant
-                if self._file_exists:
-                    ok_w, reason_w, _ = check_path_writable(self.source)
-                    self._file_writable = bool(ok_w)
-                    self._file_writable_reason = reason_w
-                else:
-                    self._file_writable = False
-                    self._file_writable_reason = "Fichier inexistant"
+                return
+
+            # Petit test heuristique pour repérer les binaires
+            # Une seule ouverture : l'échantillon sert à la détection
+            # des binaires puis à la vérification d'encodage
+            try:
+                sample = self._read_sample()
+            except Exception as e:
+                # Impossible d'ouvrir en binaire -> on considèrera illisible,
+                # et l'écriture reste indéterminée
+                self._file_readable = False
+                self._file_readable_reason = f"Lecture binaire impossible: {e}"
+                self._file_readable_flag = "fatal_error"
+                self._writable_probed = True
+                return
+
+            # Seuil simple: présence d'un octet nul => binaire
+            # (dans les 4096 premiers octets ; fichier vide => lisible),
+            # sauf BOM UTF-16/32 qui signale un texte
+            if (
+                _wide_bom_encoding(sample) is None
+                and sample.find(b"\x00", 0, 4096) != -1
+            ):
+                self._file_readable = False
+                self._file_readable_reason = "Fichier binaire détecté"
+                self._file_readable_flag = "fatal_error"
+                return
+
+            # Texte plausible -> faire la vérification d'encodage
+            if self._file_exists:
+                self._set_encoding(sample)
             else:
-                # Petit test heuristique pour repérer les binaires
-                try:
-                    with p.open("rb") as f:
-                        sample = f.read(4096)
-                except Exception as e:
-                    # Impossible d'ouvrir en binaire -> on considèrera illisible
-                    self._file_readable = False
-                    self._file_readable_reason = f"Lecture binaire impossible: {e}"
-                    self._file_readable_flag = "fatal_error"
-                    self._file_writable = None
-                    self._file_writable_reason = None
-                else:
-                    if not sample:
-                        # Fichier vide -> considérer lisible (UTF-8)
-                        is_binary = False
-                    else:
-                        # Seuil simple: présence d'un octet nul => binaire
-                        is_binary = b"\x00" in sample
-
-                    if is_binary:
-                        self._file_readable = False
-                        self._file_readable_reason = "Fichier binaire détecté"
-                        self._file_readable_flag = "fatal_error"
-                        # Écriture : on laisse l'état vérifié si possible
-                        if self._file_exists:
-                            ok_w, reason_w, _ = check_path_writable(self.source)
-                            self._file_writable = bool(ok_w)
-                            self._file_writable_reason = reason_w
-                        else:
-                            self._file_writable = False
-                            self._file_writable_reason = "Fichier inexistant"
-                    else:
-                        # Texte plausible -> faire la vérification d'encodage
-                        ok_r, reason_r, flag_r = check_path_readable(self.source)
-                        self._file_readable = bool(ok_r)
-                        self._file_readable_reason = reason_r
-                        self._file_readable_flag = flag_r
-                        if flag_r == "warning":
-                            # mémoriser l'encodage fallback pour read()
-                            self._read_encoding = "latin-1"
-                        # Écriture
-                        self._file_writable, self._file_writable_reason, _ = (
-                            check_path_writable(self.source)
-                            if self._file_exists
-                            else (False, "Fichier inexistant", "fatal_error")
-                        )
-
-            # Mode strict : on lève des erreurs précises si accès impossible
-            if self.strict:
-                if not self._file_exists:
-                    raise DocumentParseError(
-                        f"Fichier introuvable ou non fichier: {self.source}"
-                    )
-                if not self._file_readable:
-                    raise DocumentParseError(
-                        f"Fichier illisible: {self.source} — "
-                        f"{self._file_readable_reason or 'raison inconnue'}"
-                    )
-                if self.require_writable:
-                    if self._file_writable is True:
-                        pass
-                    elif self._file_writable is False:
-                        raise DocumentParseError(
-                            f"Fichier non ouvrable en écriture: {self.source} "
-                            f"— {self._file_writable_reason or 'raison inconnue'}"
-                        )
-                    else:
-                        raise DocumentParseError(
-                            f"Capacité d'écriture non vérifiable pour ce stockage: "
-                            f"{self.source}"
-                        )
-        except DocumentParseError:
-            raise
+                ok_r, reason_r, flag_r = check_path_readable(self.source)
+                self._file_readable = bool(ok_r)
+                self._file_readable_reason = reason_r
+                self._file_readable_flag = flag_r
+        except Exception:
+            # Ne bloque jamais l'accès en cas d'erreur inattendue
+            pass
+
+    def _read_sample(self) -> bytes:
+        """Lit les ENCODING_PROBE_SIZE premiers octets du fichier.
+
+        Appels os directs (sans pathlib) : c'est la seule lecture effectuée
+        par les sondes.
+        """
+        fd = os.open(self.source, os.O_RDONLY)
+        try:
+            return os.read(fd, ENCODING_PROBE_SIZE)
+        finally:
+            os.close(fd)
+
+    def _set_encoding(self, sample: bytes) -> None:
+        """Détecte l'encodage à partir de l'échantillon déjà lu.
+
+        Le fichier est lisible ; si ce n'est pas de l'UTF-8, l'encodage de
+        repli détecté est mémorisé pour read() et signalé par un warning.
+        """
+        encodage = _wide_bom_encoding(sample) or detect_text_encoding(sample)
+        self._file_readable = True
+        if encodage is not None:
+            self._file_readable_reason = ENCODING_FALLBACK_REASON.format(encodage)
+            self._file_readable_flag = "warning"
+            self._read_encoding = encodage
+
+    def _probe_writable(self) -> None:
+        """Vérifie (une seule fois) que le fichier est ouvrable en écriture."""
+        self._probe_readable()
+        if self._writable_probed:
+            return
+        self._writable_probed = True
+        try:
+            if self._file_exists:
+                ok_w, reason_w, _ = check_path_writable(
+                    self.source, assume_file=True
+                )
+                self._file_writable = bool(ok_w)
+                self._file_writable_reason = reason_w
+            else:
+                self._file_writable = False
+                self._file_writable_reason = "Fichier inexistant"
         except Exception:
-            # Ne bloque jamais l'instanciation en cas d'erreur inattendue
             pass
 
     # Propriétés d'accès simples
@@ -156,6 +245,7 @@ class DocumentFile:
         bool
             True si le fichier existe, False sinon.
         """
+        self._probe_readable()
         return bool(self._file_exists)
 
     @property
@@ -167,6 +257,7 @@ class DocumentFile:
         bool
             True si le fichier est lisible, False sinon.
         """
+        self._probe_readable()
         return bool(self._file_readable)
 
     @property
@@ -178,6 +269,7 @@ class DocumentFile:
         bool
             True si le fichier est modifiable, False sinon.
         """
+        self._probe_writable()
         return bool(self._file_writable)
 
     @property
@@ -189,6 +281,7 @@ class DocumentFile:
         str, optional
             Message d'erreur si le fichier n'est pas lisible, None sinon.
         """
+        self._probe_readable()
         return self._file_readable_reason
 
     @property
@@ -200,6 +293,7 @@ class DocumentFile:
         str, optional
             'warning', 'error' ou 'fatal_error', ou None si lisible.
         """
+        self._probe_readable()
         return self._file_readable_flag
 
     @property
@@ -211,6 +305,7 @@ class DocumentFile:
         str, optional
             Message d'erreur si le fichier n'est pas modifiable, None sinon.
         """
+        self._probe_writable()
         return self._file_writable_reason
 
     @property
@@ -220,8 +315,9 @@ class DocumentFile:
         Retourne
         --------
         str, optional
-            Encodage à utiliser (ex: 'latin-1'), ou None si UTF-8.
+            Encodage à utiliser (ex: 'cp1252', 'latin-1'), ou None si UTF-8.
         """
+        self._probe_readable()
         return self._read_encoding
 
     @property
@@ -231,9 +327,11 @@ class DocumentFile:
         Retourne
         --------
         Path
-            Objet Path du fichier.
+            Objet Path du fichier (créé une seule fois par document).
         """
-        return Path(self.source)
+        if self._path is None:
+            self._path = Path(self.source)
+        return self._path
 
     @property
     def parent(self) -> Path:
@@ -244,7 +342,7 @@ class DocumentFile:
         Path
             Dossier parent du fichier.
         """
-        return Path(self.source).parent
+        return self.path.parent
 
     @property
     def stem(self) -> str:
@@ -255,7 +353,7 @@ class DocumentFile:
         str
             Nom du fichier sans extension.
         """
-        return Path(self.source).stem
+        return self.path.stem
 
     @property
     def suffix(self) -> str:
@@ -266,7 +364,7 @@ class DocumentFile:
         str
             Extension du fichier avec le point (ex: '.tex').
         """
-        return Path(self.source).suffix
+        return self.path.suffix
 
     def check_file(self, mode: str = "read") -> tuple[bool, List[List[str]]]:
         """Vérifie l'état du fichier selon le mode demandé.
@@ -286,7 +384,7 @@ class DocumentFile:
         Notes
         -----
         Modes supportés :
-        - 'read'  : existence + readable (UTF-8) ; si fallback latin-1 => warning
+        - 'read'  : existence + readable (UTF-8) ; si encodage de repli => warning
         - 'write' : existence + writable (test non destructif)
         - 'exists': existence seulement
         """
@@ -297,6 +395,7 @@ class DocumentFile:
             ]
 
         # Existence
+        self._probe_readable()
         if not self._file_exists:
             return False, [["Fichier introuvable", "fatal_error"]]
 
@@ -305,7 +404,7 @@ class DocumentFile:
 
         # Mode lecture
         if mode == "read":
-            # readable_flag may be 'warning' when latin-1 fallback used
+            # readable_flag may be 'warning' when a fallback encoding is used
             if self._file_readable:
                 if self._file_readable_flag == "warning":
                     return (
@@ -327,6 +426,7 @@ class DocumentFile:
             ]
 
         # Mode écriture
+        self._probe_writable()
         if self._file_writable is True:
             return True, []
         if self._file_writable is False:
@@ -354,8 +454,10 @@ class DocumentFile:
     def read(self) -> str:
         """Lit et retourne le contenu du fichier.
 
-        Utilise l'encodage détecté (UTF-8 ou fallback latin-1).
-        Le contenu est mis en cache après la première lecture.
+        Utilise l'encodage détecté (UTF-8 ou encodage de repli). Si l'encodage
+        de repli, détecté sur le début du fichier, ne décode pas la suite,
+        la lecture se fait en latin-1. Le contenu est mis en cache après la
+        première lecture.
 
         Retourne
         --------
@@ -369,13 +471,92 @@ class DocumentFile:
         """
         if self._raw is None:
             try:
-                p = Path(self.source)
-                encoding = self._read_encoding or "utf-8"
-                self._raw = p.read_text(encoding=encoding, errors="strict")
+                p = self.path
+                encoding = self.read_encoding or "utf-8"
+                try:
+                    self._raw = p.read_text(encoding=encoding, errors="strict")
+                except UnicodeDecodeError:
+                    if encoding in ("utf-8", "latin-1"):
+                        raise
+                    self._raw = p.read_text(encoding="latin-1")
             except Exception as e:
                 raise DocumentParseError(f"Unable to read source {self.source}: {e}")
         return self._raw
 
+    def read_until(self, marker: str) -> tuple[str, bool]:
+        """Lit le fichier jusqu'à la première ligne commençant par marker.
+
+        Permet d'extraire une zone située en tête de document (ex: bloc YAML
+        des métadonnées) sans charger tout le fichier. Si le contenu est déjà
+        en cache, ou si le marqueur est absent (le fichier a alors été lu en
+        entier et le contenu est mis en cache), le contenu complet est
+        retourné.
+
+        Paramètres
+        ----------
+        marker : str
+            Début de la ligne à laquelle s'arrêter (incluse).
+
+        Retourne
+        --------
+        tuple[str, bool]
+            (texte, complet) où complet indique si texte est le contenu
+            entier du fichier.
+
+        Raises
+        ------
+        DocumentParseError
+            Si la lecture échoue.
+        """
+        if self._raw is not None:
+            return self._raw, True
+
+        lignes: List[str] = []
+        try:
+            encoding = self.read_encoding or "utf-8"
+            with self.path.open("r", encoding=encoding, errors="strict") as f:
+                for ligne in f:
+                    lignes.append(ligne)
+                    if ligne.startswith(marker):
+                        return "".join(lignes), False
+        except UnicodeDecodeError:
+            # Encodage de repli insuffisant : read() gère la relecture
+            return self.read(), True
+        except Exception as e:
+            raise DocumentParseError(f"Unable to read source {self.source}: {e}")
+
+        self._raw = "".join(lignes)
+        return self._raw, True
+
+    def read_head(self, nbytes: int = 16384) -> str:
+        """Lit uniquement le début du fichier.
+
+        Utile pour repérer des marqueurs situés en tête de document sans
+        charger tout le fichier. Si le contenu est déjà en cache, il est
+        réutilisé.
+
+        Paramètres
+        ----------
+        nbytes : int, optional
+            Nombre d'octets à lire. Défaut : 16384.
+
+        Retourne
+        --------
+        str
+            Début du fichier (octets invalides remplacés).
+
+        Raises
+        ------
+        OSError
+            Si le fichier ne peut pas être ouvert.
+        """
+        if self._raw is not None:
+            return self._raw[:nbytes]
+        with self.path.open("rb") as f:
+            return f.read(nbytes).decode(
+                self._read_encoding or "utf-8", errors="replace"
+            )
+
     def write(
         self, content: str, encoding: str = "utf-8"
     ) -> tuple[bool, List[List[str]]]:
@@ -404,7 +585,7 @@ class DocumentFile:
                 ]
 
             # Écrire le fichier
-            Path(self.source).write_text(content, encoding=encoding)
+            self.path.write_text(content, encoding=encoding)
 
             # Invalider le cache de lecture
             self._raw = None
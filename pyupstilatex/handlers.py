@@ -123,14 +123,22 @@ class HandlerPyUpstiLatexV2(DocumentPyUpstiLatexVersionHandler):
         """Parse les métadonnées depuis le front-matter YAML.
 
         Utilise le parser YAML pour extraire les métadonnées du bloc
-        délimité par --- au début du fichier.
+        délimité par --- au début du fichier. Seul le début du fichier,
+        jusqu'à la fin du bloc, est lu si le contenu n'est pas déjà chargé.
 
         Retourne
         --------
         Tuple[Optional[Dict], List[List[str]]]
             Dictionnaire des métadonnées extraites et liste de messages.
         """
-        return parse_metadata_yaml(self.document.content)
+        texte, complet = self.document.file.read_until(
+            "%### END metadonnees_yaml ###"
+        )
+        metadata, errors = parse_metadata_yaml(texte)
+        if not metadata and not errors and not complet:
+            # Bloc introuvable dans la zone lue : analyser le fichier entier
+            return parse_metadata_yaml(self.document.content)
+        return metadata, errors
 
     def set_metadata(self, key: str, value: any) -> Tuple[bool, List[List[str]]]:
         """Ajoute une métadonnée dans le bloc YAML.
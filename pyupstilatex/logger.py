@@ -1,6 +1,7 @@
 import logging
+from contextlib import contextmanager, nullcontext
 from dataclasses import dataclass
-from typing import Callable, Dict, Optional
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 # Séparateurs
 SEPARATORS = {
@@ -18,6 +19,14 @@ COLOR_LIGHT_GREEN = "\033[38;2;200;255;200m"
 COLOR_DARK_GRAY = "\033[90m"
 COLOR_RESET = "\033[0m"
 
+# Flèches colorées (commande infos et sa légende), construites une seule fois
+ARROW_OK = f"{COLOR_GREEN}=>{COLOR_RESET}"
+ARROW_DEDUCTED = f"{COLOR_LIGHT_GREEN}=>{COLOR_RESET}"
+ARROW_DEFAULT = f"{COLOR_DARK_GRAY}=>{COLOR_RESET}"
+ARROW_WARNING = f"{COLOR_ORANGE}=>{COLOR_RESET}"
+ARROW_ERROR = f"{COLOR_RED}=>{COLOR_RESET}"
+ARROW_INFO = f"{COLOR_LIGHT_BLUE}=>{COLOR_RESET}"
+
 
 @dataclass
 class FormattedMessage:
@@ -215,6 +224,8 @@ class MessageHandler:
         self.verbose = bool(verbose)
         self._logger = logging.getLogger(logger_name)
         self._formatters = formatters or DEFAULT_FORMATTERS
+        self._buffer: Optional[List[Tuple[int, str]]] = None
+        self._file_handler: Optional[logging.FileHandler] = None
         self._configure_logger(log_file, console_level, file_level)
 
     def _configure_logger(self, log_file, console_level, file_level):
@@ -244,6 +255,17 @@ class MessageHandler:
                     )
                 )
                 self._logger.addHandler(fh)
+                self._file_handler = fh
+
+    def close(self):
+        """Ferme le fichier de log (ouvert une seule fois pour toute la session).
+
+        À appeler en fin d'exécution ; sans effet s'il n'y a pas de fichier de log.
+        """
+        fh, self._file_handler = self._file_handler, None
+        if fh is not None:
+            self._logger.removeHandler(fh)
+            fh.close()
 
     def format_message(
         self, typ: str, texte: str, flag: str = None, last: bool = False
@@ -303,11 +325,48 @@ class MessageHandler:
         flag = message.get("flag")
         last = message.get("last", False)
         formatted = self.format_message(typ, texte, flag, last)
-        if formatted.text == "" and formatted.level == logging.INFO:
+        if self._buffer is not None:
+            self._buffer.append((formatted.level, formatted.text))
+        elif formatted.text == "" and formatted.level == logging.INFO:
             self._logger.info("")
         else:
             self._logger.log(formatted.level, formatted.text)
 
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Regroupe les messages émis dans le bloc en un minimum d'écritures.
+
+        Les messages sont mis en tampon puis, à la sortie du bloc, les lignes
+        consécutives de même niveau sont émises en un seul enregistrement
+        (une seule écriture console et fichier). Les blocs imbriqués sont
+        fusionnés dans le bloc englobant.
+
+        Exemples
+        --------
+        >>> with msg.batch():
+        ...     for ligne in lignes:
+        ...         msg.info(ligne)
+        """
+        if self._buffer is not None:
+            yield
+            return
+
+        self._buffer = []
+        try:
+            yield
+        finally:
+            buffer, self._buffer = self._buffer, None
+            lines: List[str] = []
+            current_level: Optional[int] = None
+            for level, text in buffer:
+                if level != current_level and lines:
+                    self._logger.log(current_level, "\n".join(lines))
+                    lines = []
+                current_level = level
+                lines.append(text)
+            if lines:
+                self._logger.log(current_level, "\n".join(lines))
+
     # Helpers
     def msg(
         self, typ: str, texte: str, verbose: Optional[bool] = None, flag: str = None
@@ -351,6 +410,29 @@ class MessageHandler:
     def info(self, texte, verbose=None, flag=None):
         self.msg("info", texte, verbose, flag)
 
+    def info_block(self, lignes: List[str], verbose=None):
+        """Émet plusieurs lignes de type info en une seule écriture.
+
+        Chaque ligne est formatée comme par info() (préfixe compris), puis
+        l'ensemble est envoyé au logger en un unique enregistrement.
+
+        Paramètres
+        ----------
+        lignes : List[str]
+            Lignes à afficher.
+        verbose : bool, optional
+            Contrôle si les lignes doivent être affichées.
+        """
+        if not lignes or verbose is False or not self.verbose:
+            return
+        formatted = [self.format_message("info", ligne) for ligne in lignes]
+        level = formatted[0].level
+        text = "\n".join(f.text for f in formatted)
+        if self._buffer is not None:
+            self._buffer.append((level, text))
+        else:
+            self._logger.log(level, text)
+
     def resultat(self, texte, verbose=None, flag=None):
         self.msg("resultat", texte, verbose, flag)
 
@@ -396,13 +478,14 @@ class MessageHandler:
             "resultat_item": self.resultat_item,
             "text": self.text,
         }.get(type, self.info)
+        last_idx = len(messages) - 1
         for idx, entry in enumerate(messages):
             texte, flag = (
                 (entry[0], entry[1])
                 if isinstance(entry, (list, tuple))
                 else (str(entry), None)
             )
-            is_last = idx == len(messages) - 1
+            is_last = idx == last_idx
             # Use the provided `type` parameter to decide passing `last`.
             if type == "resultat_item" and format_last:
                 writer(texte, flag=flag, last=is_last)
@@ -416,6 +499,12 @@ class NoOpMessageHandler:
     def emit(self, message: dict):
         pass
 
+    def batch(self):
+        return nullcontext()
+
+    def close(self):
+        pass
+
     def msg(
         self, typ: str, texte: str, verbose: Optional[bool] = None, flag: str = None
     ):
@@ -439,6 +528,9 @@ class NoOpMessageHandler:
     def info(self, texte, verbose=None, flag=None):
         pass
 
+    def info_block(self, lignes, verbose=None):
+        pass
+
     def resultat(self, texte, verbose=None, flag=None):
         pass
 